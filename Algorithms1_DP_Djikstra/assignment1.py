@@ -1,4 +1,10 @@
 from math import inf
+from array import array
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from hashlib import sha256
+import os
+import tempfile
 ######## Question 1
 
 def restaurantFinder(d: int, site_list: list[int]) -> tuple[int, list]:
@@ -58,10 +64,254 @@ def restaurantFinder(d: int, site_list: list[int]) -> tuple[int, list]:
     return total_revenue, selected_sites
 
 
+RESTAURANT_BLOCK_COST = 24         # time of one block of _restaurant_blocks, in sites of restaurantFinder
+
+def restaurantFinderMany(ds: list[int], site_list: list[int]) -> list[tuple[int, list]]:
+    """
+    Function Description:
+        Same as restaurantFinder for every distance parameter in ds, on the same road.
+
+    Approach Description:
+        Requires NumPy. The DP of restaurantFinder is run for many values of d at once, with one 
+        column per d, where
+            site_revenue[i] = max(site_revenue[i-1], site_revenue[i-d-1] + site_list[i])
+        In a block of b sites, b at most d+1, every site_revenue[i-d-1] is before the block and
+        already known, so a whole block of every column takes a few NumPy calls, refer to 
+        _restaurant_blocks, and the road takes N/b blocks, b = min(ds)+1.
+        A small d makes small blocks, and a block costs about RESTAURANT_BLOCK_COST sites of the 
+        loop of restaurantFinder, so with ds in order, the smallest ones can be cheaper with 
+        restaurantFinder. For every split of the sorted ds, the cost per site is the number of 
+        d before the split, each one site of restaurantFinder, plus the cost of a block over 
+        the size of the blocks of the rest, and the cheapest split is taken.
+
+    Input:
+        ds: list of distance parameters, non-negative
+        site_list: a list of int, denoting revenue of sites 1km apart
+
+    Output:
+        list of (total_revenue, selected_sites) as in restaurantFinder, one for every d in ds
+
+    Time Complexity: O(N*D + D*log(D)) where N is len(site_list) and D is len(ds)
+    Aux space complexity: O(N*D/8 + M*D) where N is len(site_list), D is len(ds) and M is max(ds)
+    """
+    order = sorted(range(len(ds)), key=ds.__getitem__)
+    split, cost = len(ds), len(ds)                      # everything through restaurantFinder
+    for j, column in enumerate(order):
+        if j + RESTAURANT_BLOCK_COST / (ds[column] + 1) < cost:
+            split, cost = j, j + RESTAURANT_BLOCK_COST / (ds[column] + 1)
+    results = [None] * len(ds)
+    for column in order[:split]:
+        results[column] = restaurantFinder(ds[column], site_list)
+    if split < len(ds):
+        blocked = _restaurant_blocks([ds[column] for column in order[split:]], site_list)
+        for column, result in zip(order[split:], blocked):
+            results[column] = result
+    return results
+
+def _restaurant_blocks(ds: list[int], site_list: list[int]) -> list[tuple[int, list]]:
+    """
+    Function Description:
+        Runs the DP of restaurantFinder for every d in ds, min(ds)+1 sites at a time, refer to 
+        restaurantFinderMany.
+
+    Approach Description:
+        Row 0 is an extra site of revenue 0 before the road, so i-d-1 is clipped to it instead
+        of needing the first d+1 sites to be handled separately. Rows are written one after 
+        another into a buffer of 2*(M+1+b) rows, M = max(ds), and once full, only the last M+1 
+        rows, all that later blocks look back to, are moved to its start. In a block, the 
+        site_revenue[i-d-1] of every site and column are gathered with one take on the buffer, 
+        at flat indices computed once for every column and position in the block and moved 
+        along with the block, then site_list is added, the first row takes the maximum with the
+        row before the block, and np.maximum.accumulate down the block writes the rows.
+        Site i is used if its site revenue is more than that of site i-1, which is all the 
+        backtrack of restaurantFinder looks at, so only that is kept for every site, as bits 
+        packed 8 columns to a byte, found from the buffer for many blocks at a time before it 
+        is moved. The selected sites of a column are then found walking back from the last site
+        as in restaurantFinder, but only over the used sites: the next site selected is the 
+        last used site at most x, and x then moves to d+1 sites before it.
+
+    Input:
+        ds: list of distance parameters, non-negative
+        site_list: a list of int, denoting revenue of sites 1km apart
+
+    Output:
+        list of (total_revenue, selected_sites) as in restaurantFinder, one for every d in ds
+
+    Time Complexity: O(N*D) where N is len(site_list) and D is len(ds), in N/(min(ds)+1) blocks
+    Aux space complexity: O(N*D/8 + M*D) where N is len(site_list), D is len(ds) and M is max(ds)
+    """
+    import numpy as np
+    n, width, block, keep = len(site_list), len(ds), min(ds) + 1, max(ds) + 1
+    sites = np.asarray(site_list, dtype=np.int64)[:, None]
+    columns = np.arange(width)
+    back = (np.arange(block)[:, None] - np.asarray(ds, dtype=np.int64) - 1) * width + columns
+    buffer = np.zeros((2 * (keep + block), width), dtype=np.int64)    # row i of the road is offset+i
+    flat = buffer.reshape(-1)
+    used = np.zeros((n + 1, (width + 7) // 8), dtype=np.uint8)         # bit of column c of site i
+    offset, marked = 0, 1                                               # first row with no used bits
+    for start in range(1, n + 1, block):
+        stop = min(start + block, n + 1)
+        if stop - offset > len(buffer):                                 # keeps the last keep rows
+            rows = buffer[marked-offset-1:start-offset]
+            used[marked:start] = np.packbits(rows[1:] > rows[:-1], axis=1)
+            marked = start
+            buffer[:keep] = buffer[start-offset-keep:start-offset]
+            offset = start - keep
+        index = back[:stop-start] + (start - offset) * width
+        if start <= keep:                                               # no row moved yet
+            np.maximum(index, columns, out=index)                       # clip to the site before the road
+        value = flat.take(index)
+        value += sites[start-1:stop-1]
+        np.maximum(value[0], buffer[start-offset-1], out=value[0])
+        np.maximum.accumulate(value, axis=0, out=buffer[start-offset:stop-offset])
+    rows = buffer[marked-offset-1:n+1-offset]
+    used[marked:n+1] = np.packbits(rows[1:] > rows[:-1], axis=1)
+    results = []
+    for column, d in enumerate(ds):
+        taken = np.flatnonzero(used[:, column >> 3] & (0x80 >> (column & 7))).tolist()
+        selected_sites = []
+        x, k = n, len(taken) - 1
+        while k >= 0:
+            if taken[k] <= x:                                           # last used site at most x
+                selected_sites.append(taken[k])
+                x = taken[k] - d - 1
+            k -= 1
+        selected_sites.reverse()
+        results.append((int(buffer[n-offset, column]), selected_sites))
+    return results
+
+class RestaurantStream:
+
+    def __init__(self, d: int, log_path: str|None = None, checkpoint: int = 1 << 20) -> None:
+        """
+        Function Description:
+            Streaming version of restaurantFinder, for roads with too many sites to hold in memory.
+            Sites are pushed one at a time, and the maximum revenue so far is known after each one.
+
+        Approach Description:
+            The DP of restaurantFinder only looks back at site_revenue[i-1] and site_revenue[i-d-1],
+            so only the last d+1 values are kept, in a ring buffer where index i % (d+1) holds 
+            site_revenue[i-d-1] until it is replaced by site_revenue[i].
+            To find the selected sites, a log keeps one bit per site, set if the site revenue 
+            increased at that site (the site is used). Walking back from the last site, a set bit
+            selects the site and skips back d+1 sites, otherwise it goes back one site, the same 
+            as restaurantFinder. The log is kept in a bytearray, and if log_path is given, every 
+            checkpoint sites the bytes are appended to the file and cleared from memory.
+
+        Input:
+            d: distance parameter, non-negative
+            log_path: file to write the log to, None to keep it in memory
+            checkpoint: number of sites per block written to log_path, positive multiple of 8, 
+                        so every block is whole bytes
+
+        Time Complexity: O(d)
+        Aux space complexity: O(d)
+        """
+        if checkpoint <= 0 or checkpoint % 8 != 0:
+            raise ValueError("checkpoint must be a positive multiple of 8: " + str(checkpoint))
+        self.d = d
+        self.ring = [0]*(d+1)                           # last d+1 values of site_revenue
+        self.total_revenue = 0                          # site_revenue of the last site
+        self.count = 0                                  # number of sites pushed
+        self.log = bytearray()                          # bits of sites not yet written to log_path
+        self.log_path = log_path
+        self.checkpoint = checkpoint
+        self.flushed = 0                                # number of sites written to log_path
+        if log_path is not None:
+            open(log_path, "wb").close()
+
+    def push(self, revenue: int) -> int:
+        """
+        Function Description:
+            Adds the next site of the road.
+
+        Input:
+            revenue: revenue of the site
+        Output:
+            maximum possible revenue of the sites pushed so far
+
+        Time Complexity: O(1), O(C) every C sites if log_path is given, where C is checkpoint
+        Aux space complexity: O(1)
+        """
+        i = self.count % (self.d+1)
+        value = self.ring[i] + revenue                  # site_revenue[i-d-1] + current site
+        bit = (self.count - self.flushed) & 7
+        if bit == 0:
+            self.log.append(0)
+        if value > self.total_revenue:                  # current site is used
+            self.total_revenue = value
+            self.log[-1] |= 1 << bit
+        self.ring[i] = self.total_revenue
+        self.count += 1
+        if self.log_path is not None and self.count - self.flushed == self.checkpoint:
+            with open(self.log_path, "ab") as log_file:
+                log_file.write(self.log)
+            self.flushed = self.count
+            self.log = bytearray()
+        return self.total_revenue
+
+    def run(self, sites: Iterable[int]) -> Iterator[int]:
+        """
+        Function Description:
+            Pushes every site from an iterable, yielding the maximum possible revenue after each.
+
+        Input:
+            sites: iterable of int, revenues of the sites in order
+        Output:
+            generator of int, as stated in push
+
+        Time Complexity: O(N) where N is the number of sites
+        Aux space complexity: O(1)
+        """
+        for revenue in sites:
+            yield self.push(revenue)
+
+    def selected_sites(self) -> list[int]:
+        """
+        Function Description:
+            Returns the selected sites for the maximum possible revenue of the sites pushed so far,
+            as in restaurantFinder.
+
+        Approach Description:
+            Walks back through the log as described in init. Blocks written to log_path are read
+            back one at a time, from the last one, so memory stays within one block.
+
+        Output:
+            selected_sites: list of the sites, numbered from 1
+
+        Time Complexity: O(N) where N is the number of sites pushed
+        Aux space complexity: O(S + C) where S is the number of sites selected and C is checkpoint
+        """
+        selected_sites = []
+        block, block_start = self.log, self.flushed
+        log_file = None
+        x = self.count - 1
+        while x >= 0:
+            if x < block_start:                         # read the block holding site x
+                if log_file is None:
+                    log_file = open(self.log_path, "rb")
+                block_start = x - x % self.checkpoint
+                log_file.seek(block_start // 8)
+                block = log_file.read(self.checkpoint // 8)
+            offset = x - block_start
+            if block[offset >> 3] >> (offset & 7) & 1:  # site x is used
+                selected_sites.append(x+1)
+                x -= self.d + 1
+            else:
+                x -= 1
+        if log_file is not None:
+            log_file.close()
+        selected_sites.reverse()
+        return selected_sites
+
+
 ############### Question 2
 
 class FloorGraph:
-    def __init__(self, paths: list[tuple[int, int, int]], keys: list[tuple[int, int]]) -> None:
+    queue_type = None                                            # set to indexedminheap below
+
+    def __init__(self, paths: list[tuple[int, int, int]], keys: list[tuple[int, int]], 
+                 layout: str = "list") -> None:
         """
         Function Description:
             A constructor that initialises the map of the floor of the tower into a graph. 
@@ -74,12 +324,18 @@ class FloorGraph:
             with direction and distance as a tuple (v,x). Keys are stored as a separate list, and 
             since keys <= vertices, it maintains both complexities.
             Vertices with no edges are stored as None, and vertices with no keys are stored as inf.
+            The reverse of every path is stored the same way in self.reverse as (u,x), so searches
+            towards the exits (used by climb_many) do not need to rebuild the graph.
+            With layout "csr", both are stored as a csradjacency instead, which holds the edges in
+            flat arrays rather than one tuple per edge. It is indexed the same way, so the searches
+            do not need to know which layout is used.
 
         Input:
             paths: a list of tuples, with tuples containing vertex u, vertex v, distance x, indicating
                    there is a paths from u to v, of distance in time, x mins.
             keys: a list of tuples, with tuples containing vertex u and time k, indicating there is
                   a key in vertex u, with k mins the time it takes to obtain the key.
+            layout: "list" for adjacency lists of tuples, "csr" for compressed sparse rows
 
         Output:
             None
@@ -88,94 +344,947 @@ class FloorGraph:
         Space Complexity: O(V+E), where V is the vertices and E is the edges in the graph
         """
         max_id = max([max(u,v) for u,v,x in paths])
-        self.vertices = [None]*(max_id+1)
-        for u,v,x in paths:
-            if self.vertices[u] is None:
-                self.vertices[u] = [(v,x)]
-            else:
-                self.vertices[u].append((v,x))
+        if layout == "csr":
+            self.vertices = csradjacency(paths, max_id+1, False)
+            self.reverse = csradjacency(paths, max_id+1, True)
+        elif layout == "list":
+            self.vertices = [None]*(max_id+1)
+            self.reverse = [None]*(max_id+1)
+            for u,v,x in paths:
+                if self.vertices[u] is None:
+                    self.vertices[u] = [(v,x)]
+                else:
+                    self.vertices[u].append((v,x))
+                if self.reverse[v] is None:
+                    self.reverse[v] = [(u,x)]
+                else:
+                    self.reverse[v].append((u,x))
+        else:
+            raise ValueError("unknown layout: " + str(layout))
         self.keys = [inf]*(max_id+1)
         for k,y in keys:
             self.keys[k] = y
+        self.cache = {}                                 # results of climb_cached
+        self.cache_index = {}                           # vertex -> cached queries that reached it
+        self.table = None                               # time and predecessor tables of precompute
 
-    def climb(self, start: int, exits: list[int]) -> tuple[int, list[int]]|None:
+    def climb(self, start: int, exits: list[int], mode: str = "layered", 
+              heuristic: callable = None) -> tuple[int, list[int]]|None:
         """
         Function Description:
             A function that finds the shortest possible path for a particular floor given the starting
             point and possible exits in the graph. 
 
         Approach Description:
-            Using a modified Dijkstra algorithm, while prioritizing the shortest possible path first,
-            we allow the algorithm to override any shorter paths if that particular vertex does not 
-            have a key, we are able to get the shortest path that has a key. Since we do not add any
-            other loops, the complexities are the same as Dijkstra algorithm.
-            Therefore we need not only need to store the shortest distance, we also need to store if the
-            current path from start has a key. Using an int to represent the time to obtain a key, with
-            inf to represent that there is no key. 
-            The priority queue used is a min heap, which also allows storage of distance information
-            other than vertex. This allows prioritizing shortest distance.
-            Then, checking against all other distances of different exits, we get the shortest distance
-            and the exit for output.
-            To find the route, as looping is possible unlike the conventional Dijkstra algorithm, there
-            is a need to trace back the different predecessors that might be pointing to the same vertex
-            multiple times. Hence, we need an array of list to store the predecessor, and a third value
-            to store the number of nodes travelled, so to know when to stop the loop.
+            Using Dijkstra algorithm on a graph with two copies of the floor. Every vertex v has two 
+            states: v in layer 0 (no key yet) and v+V in layer 1 (holding a key). Paths connect 
+            states within the same layer, and every key vertex u has one more edge from u to u+V 
+            with time keys[u], for obtaining the key. A route that clears the floor is then a path 
+            from start to an exit in layer 1, so a single plain Dijkstra over the 2V states gives 
+            the shortest time, even if the route has to loop back through a vertex after the key.
+            The first exit of layer 1 to be popped is the answer, so the search stops there.
+            The priority queue used is a min heap indexed by state, so when a distance is updated 
+            the state already in the queue is moved instead of pushed again, keeping at most 2V 
+            entries in the queue. Its push/pop counters and largest size are kept in 
+            self.queue_stats after every call.
+            Every state is settled once, so it only needs one predecessor, and the route is traced
+            back through the predecessors by _layered_route without changing them, so the same 
+            FloorGraph can be queried any number of times.
+            With mode "astar", states are prioritised by their time plus heuristic(vertex), a lower
+            bound of the time left to reach an exit, so the search heads towards the exits first. 
+            A state may then be reached again with a shorter time after being popped, in which 
+            case it is pushed again, and the first exit popped is still the shortest.
+            With mode "bidirectional", the search is done by _climb_bidirectional instead.
+            If the table of precompute is loaded, mode "layered" is answered from it instead.
+            The number of states popped is kept in self.settled after every call, to compare modes.
 
         Input:
             start: int that represents the starting vertex ID
             exits: a list of int that represent possible exit vertices ID
+            mode: "layered" for Dijkstra, "astar" for A* or "bidirectional" for bidirectional Dijkstra
+            heuristic: for mode "astar", function of a vertex ID giving a lower bound of the time
+                       from that vertex to the nearest exit, must never be more than the real time
             
         Output:
             total_time: shortest time taken to clear a floor in mins
             route: route that is taken for shortest time in list of vertices
 
         Time Complexity: O(E*log(V)), where V is the vertices and E is the edges in the graph
-        Space Complexity: O(V+E), where V is the vertices and E is the edges in the graph
+        Space Complexity: O(V), where V is the vertices
         """
-        distance = [(inf,inf,inf)]*len(self.vertices)  #total distance, min key through route, nodes travelled
-        predecessor = []
-        for _ in range(len(self.vertices)):
-            predecessor.append([])
-        distance[start] = (0, self.keys[start], 0)               #start initialised to 0
-        queue = minheap((start, distance[start][0]))             #priority queue
-        while not queue.is_empty():        
-            vertex = queue.pop()        
-            if self.vertices[vertex[0]]:                         #checks if vertex goes anywhere
-                for v,x in self.vertices[vertex[0]]:             #iterates through all its edges
-                    min_key = distance[vertex[0]][1]
-                    if distance[vertex[0]][0] + x < distance[v][0]:   #if distance is shorter (regardless of key)
-                        if min_key > self.keys[v]:                    #updates key if it takes a shorter time
-                            min_key = self.keys[v]
-                        distance[v] = distance[vertex[0]][0] + x, \
-                            min_key, distance[vertex[0]][2] + 1       #updates the values
-                        queue.push((v, distance[v][0]))
-                        predecessor[v].append(vertex[0])
-                    elif distance[vertex[0]][0] + distance[vertex[0]][1] + x \
-                            < distance[v][0] + distance[v][1]:        #compares with key as well, no key represented by inf
-                        distance[v] = distance[vertex[0]][0] + x, \
-                            min_key, distance[vertex[0]][2] + 1    
-                        queue.push((v, distance[v][0]))
-                        predecessor[v].append(vertex[0])
+        if mode == "bidirectional":
+            return self._climb_bidirectional(start, exits)
+        elif mode == "astar":
+            if heuristic is None:
+                raise ValueError("astar mode needs a heuristic")
+        elif mode == "layered":
+            heuristic = None
+            if self.table is not None:
+                return self._climb_table(start, exits)
+        else:
+            raise ValueError("unknown mode: " + str(mode))
+        end, distance, predecessor = self._search(start, exits, heuristic)
+        if end is None:                                         # if no possible paths
+            return None
+        return distance[end], self._layered_route(predecessor, end)
+
+    def _climb_table(self, start: int, exits: list[int]) -> tuple[int, list[int]]|None:
+        """
+        Function Description:
+            climb answered from the table of precompute, refer to precompute.
+
+        Approach Description:
+            The time of every exit is read from row start of the time table, and the route to the
+            fastest one is traced back through row start of the predecessor table.
+
+        Input:
+            start, exits: as stated in climb
+
+        Output:
+            as stated in climb
+
+        Time Complexity: O(|exits| + R), where R is the length of the route
+        Space Complexity: O(R), where R is the length of the route
+        """
+        times, preds = self.table
         total_time, end = inf, None
-        for exit in exits:                                      #find shortest exit
-            if distance[exit][0] + distance[exit][1] < total_time:
-                total_time, end = distance[exit][0] + distance[exit][1], exit
-        if total_time is inf:                                   # if no possible paths
+        for exit in exits:                                      # find shortest exit
+            if times[start, exit] < total_time:
+                total_time, end = times[start, exit], exit
+        if end is None:                                         # if no possible paths
+            return None
+        return int(total_time), self._layered_route(preds[start], end + len(self.vertices))
+
+    def _search(self, start: int, exits: list[int], 
+                heuristic: callable) -> tuple[int|None, list[int], list[int|None]]:
+        """
+        Function Description:
+            The two-layer Dijkstra or A* search of climb, refer to climb.
+
+        Input:
+            start, exits: as stated in climb
+            heuristic: as stated in climb, None for Dijkstra
+
+        Output:
+            end: state of the exit reached first, None if there is no possible path
+            distance: time to reach every state, inf if not reached
+            predecessor: predecessor state of every state, None for the start and unreached states
+
+        Time Complexity: O(E*log(V)), where V is the vertices and E is the edges in the graph
+        Space Complexity: O(V), where V is the vertices
+        """
+        n = len(self.vertices)
+        is_exit = [False]*n
+        for exit in exits:
+            is_exit[exit] = True
+        distance = [inf]*(2*n)                                  # layer 0, then layer 1
+        predecessor = [None]*(2*n)
+        distance[start] = 0                                     # start initialised to 0
+        queue = self.queue_type((start, 0), 2*n)                # priority queue
+        end = None
+        while not queue.is_empty():
+            state = queue.pop()[0]
+            time = distance[state]
+            if state >= n:                                      # holding a key
+                vertex = state - n
+                if is_exit[vertex]:                             # first exit popped is the shortest
+                    end = state
+                    break
+            else:
+                vertex = state
+                key_state = state + n
+                if time + self.keys[vertex] < distance[key_state]:    # obtain the key here
+                    distance[key_state] = time + self.keys[vertex]
+                    predecessor[key_state] = state
+                    if heuristic is None:
+                        queue.push((key_state, distance[key_state]))
+                    else:
+                        queue.push((key_state, distance[key_state] + heuristic(vertex)))
+            edges = self.vertices[vertex]
+            if edges:                                           # checks if vertex goes anywhere
+                layer = state - vertex                          # 0 or n
+                for v, x in edges:                              # iterates through all its edges
+                    if time + x < distance[v + layer]:
+                        distance[v + layer] = time + x
+                        predecessor[v + layer] = state
+                        if heuristic is None:
+                            queue.push((v + layer, time + x))
+                        else:
+                            queue.push((v + layer, time + x + heuristic(v)))
+        self.queue_stats = queue.stats()
+        self.settled = self.queue_stats["pops"]
+        return end, distance, predecessor
+
+    def _climb_bidirectional(self, start: int, exits: list[int]) -> tuple[int, list[int]]|None:
+        """
+        Function Description:
+            Bidirectional version of climb, searching forward from start and backward from the 
+            exits at the same time on the two-layer graph.
+
+        Approach Description:
+            The forward search is the same as climb, on self.vertices. The backward search starts
+            from every exit in layer 1 at time 0 and follows self.reverse, going back from u+V to 
+            u with time keys[u] for obtaining the key. Each step settles the state from the queue 
+            with the smaller time, and every time a state is reached by one search that was already
+            reached by the other, best is updated with the total time through that state.
+            Once the two smallest times in the queues add up to at least best, no shorter route 
+            can be found, and the route is traced back from the meeting state to start through the
+            forward predecessors, then forward to the exit through the backward successors.
+            Only the states closer to start or to an exit than about half of the answer are 
+            settled, which is much fewer than a single search when the exit is close.
+
+        Input:
+            start: int that represents the starting vertex ID
+            exits: a list of int that represent possible exit vertices ID
+
+        Output:
+            total_time: shortest time taken to clear a floor in mins
+            route: route that is taken for shortest time in list of vertices
+
+        Time Complexity: O(E*log(V)), where V is the vertices and E is the edges in the graph
+        Space Complexity: O(V), where V is the vertices
+        """
+        n = len(self.vertices)
+        forward, backward = [inf]*(2*n), [inf]*(2*n)
+        predecessor, successor = [None]*(2*n), [None]*(2*n)
+        forward[start] = 0
+        queues = self.queue_type((start, 0), 2*n), self.queue_type(None, 2*n)
+        for exit in exits:
+            backward[exit + n] = 0
+            queues[1].push((exit + n, 0))
+        best, meet = inf, None
+        settled = 0
+        while not queues[0].is_empty() and not queues[1].is_empty():
+            if queues[0].peek()[1] + queues[1].peek()[1] >= best:     # no shorter route left
+                break
+            side = 0 if queues[0].peek()[1] <= queues[1].peek()[1] else 1
+            state, time = queues[side].pop()
+            settled += 1
+            vertex = state % n
+            if side == 0:
+                distance, other, links, adjacency = forward, backward, predecessor, self.vertices
+                key_state = state + n if state < n else None    # obtain the key here
+            else:
+                distance, other, links, adjacency = backward, forward, successor, self.reverse
+                key_state = state - n if state >= n else None   # the key was obtained here
+            steps = []
+            if key_state is not None and self.keys[vertex] is not inf:
+                steps.append((key_state, self.keys[vertex]))
+            edges = adjacency[vertex]
+            if edges:
+                layer = state - vertex                          # 0 or n
+                for v, x in edges:
+                    steps.append((v + layer, x))
+            for next_state, x in steps:
+                if time + x < distance[next_state]:
+                    distance[next_state] = time + x
+                    links[next_state] = state
+                    queues[side].push((next_state, time + x))
+                    if distance[next_state] + other[next_state] < best:   # both searches met
+                        best, meet = distance[next_state] + other[next_state], next_state
+        self.settled = settled
+        self.queue_stats = queues[0].stats()
+        for name, count in queues[1].stats().items():
+            self.queue_stats[name] += count
+        if meet is None:                                        # if no possible paths
             return None
-        route = [end]                                           #finding the route
-        travelled = distance[end][2]                            
-        while travelled > 0:                                    #loop till number of nodes traversed
-            pred = predecessor[end][-1]
-            route.append(pred)
-            del predecessor[end][-1]
-            end = pred
-            travelled -= 1
+        route = self._layered_route(predecessor, meet)
+        state = meet
+        while successor[state] is not None:
+            if successor[state] != state + n:                   # skip obtaining the key
+                route.append(successor[state] % n)
+            state = successor[state]
+        return best, route
+
+    def _layered_route(self, predecessor: list[int|None], state: int) -> list[int]:
+        """
+        Function Description:
+            Traces back the route to a state of the two-layer graph, without changing predecessor.
+
+        Input:
+            predecessor: predecessor state of every state, None or -1 for the start
+            state: state the route ends at
+
+        Output:
+            route in list of vertices
+
+        Time Complexity: O(V), where V is the vertices
+        Space Complexity: O(V), where V is the vertices
+        """
+        n = len(self.vertices)
+        route = [state % n]
+        pred = predecessor[state]
+        while pred is not None and pred >= 0:                   # -1 for none in precompute tables
+            if pred + n != state:                               # skip obtaining the key
+                route.append(int(pred) % n)
+            state = pred
+            pred = predecessor[state]
         route.reverse()
-        return total_time, route
+        return route
+
+    def climb_many(self, queries: list[tuple[int, list[int]]]) -> list[tuple[int, list[int]]|None]:
+        """
+        Function Description:
+            Answers a batch of climb queries against the same floor, reusing the graph and the 
+            searches between queries that share the same exits.
+
+        Approach Description:
+            Instead of searching forward from every start, we search backwards from the exits.
+            Queries are grouped by their set of exits, and for every group only two reverse 
+            Dijkstra searches are run on self.reverse:
+            1. From all exits at once, giving to_exit[v], the shortest time from v to any exit 
+               once the key is held.
+            2. From every key vertex k at once, seeded with keys[k] + to_exit[k], giving 
+               to_key[v], the shortest time from v to pick up a key and then leave by an exit.
+            Each search keeps the next vertex towards its sources, so the route of a query is 
+            found by walking from start along the second search until a key vertex (a source) 
+            is reached, then along the first search until an exit.
+            Every query in the group is then answered in O(1) plus the length of its route.
+            The time is the same as climb, though the route may differ when there are ties.
+
+        Input:
+            queries: a list of tuples (start, exits), as the inputs of climb
+
+        Output:
+            A list with the result of every query in the same order, each being 
+            (total_time, route) as in climb, or None if there is no possible path.
+
+        Time Complexity: O(G*E*log(V) + Q*V), where G is the number of distinct exit lists, Q is 
+                         the number of queries, V is the vertices and E is the edges in the graph
+        Space Complexity: O(G*V + Q), where G is the number of distinct exit lists and Q is the 
+                          number of queries
+        """
+        groups = {}                                              # exits -> query indices
+        for i, (start, exits) in enumerate(queries):
+            group = tuple(sorted(set(exits)))
+            if group in groups:
+                groups[group].append(i)
+            else:
+                groups[group] = [i]
+        results = [None]*len(queries)
+        for exits, indices in groups.items():
+            to_exit, after_key = self._reverse_search([(exit, 0) for exit in exits])
+            seeds = []
+            for k, key in enumerate(self.keys):                  # bridge from every key vertex
+                if key is not inf and to_exit[k] is not inf:
+                    seeds.append((k, key + to_exit[k]))
+            to_key, before_key = self._reverse_search(seeds)
+            for i in indices:
+                start = queries[i][0]
+                if to_key[start] is inf:                         # if no possible paths
+                    continue
+                route = [start]
+                while before_key[route[-1]] is not None:         # walk towards the key vertex
+                    route.append(before_key[route[-1]])
+                while after_key[route[-1]] is not None:          # then towards the exit
+                    route.append(after_key[route[-1]])
+                results[i] = to_key[start], route
+        return results
+
+    def _reverse_search(self, sources: list[tuple[int, int]]) -> tuple[list[int], list[int|None]]:
+        """
+        Function Description:
+            Multi-source Dijkstra on the reversed graph, used by climb_many.
+
+        Approach Description:
+            Every source starts with its own initial time instead of 0, which lets the key 
+            vertices carry the time of the rest of the route. Outdated entries are skipped when
+            popped, which only happens if queue_type is set to the lazy minheap.
+
+        Input:
+            sources: a list of tuples (vertex, initial time)
+
+        Output:
+            distance: shortest time from every vertex to reach any source, inf if impossible
+            successor: next vertex on that shortest route, None for sources and unreachable vertices
+
+        Time Complexity: O(E*log(V)), where V is the vertices and E is the edges in the graph
+        Space Complexity: O(V+E), where V is the vertices and E is the edges in the graph
+        """
+        distance = [inf]*len(self.vertices)
+        successor = [None]*len(self.vertices)
+        queue = self.queue_type(None, len(self.vertices))
+        for v, time in sources:
+            if time < distance[v]:
+                distance[v] = time
+                queue.push((v, time))
+        while not queue.is_empty():
+            v, time = queue.pop()
+            edges = self.reverse[v]
+            if time > distance[v] or edges is None:              # outdated entry or no way in
+                continue
+            for u, x in edges:
+                if time + x < distance[u]:
+                    distance[u] = time + x
+                    successor[u] = v
+                    queue.push((u, distance[u]))
+        self.queue_stats = queue.stats()
+        return distance, successor
+
+    def add_vertex(self) -> int:
+        """
+        Function Description:
+            Adds a vertex with no paths and no key to the floor.
+
+        Approach Description:
+            Appends to the lists of the graph, which are grown by Python in amortised O(1).
+            No cached result can change, as no route can reach the new vertex yet.
+
+        Output:
+            ID of the new vertex
+
+        Time Complexity: O(1) amortised
+        Space Complexity: O(1)
+        """
+        self._before_update()
+        self.vertices.append(None)
+        self.reverse.append(None)
+        self.keys.append(inf)
+        return len(self.vertices) - 1
+
+    def add_path(self, u: int, v: int, x: int) -> None:
+        """
+        Function Description:
+            Adds a path from u to v taking x mins, adding vertices if u or v is new.
+
+        Approach Description:
+            Appends (v,x) to the edges of u and (u,x) to the reverse edges of v, as in init.
+            Only cached results whose search reached u can change.
+
+        Input:
+            u, v, x: as stated in init
+
+        Time Complexity: O(1) amortised, plus the size of the cached searches invalidated
+        Space Complexity: O(1)
+        """
+        self._before_update()
+        while max(u, v) >= len(self.vertices):
+            self.add_vertex()
+        if self.vertices[u] is None:
+            self.vertices[u] = [(v,x)]
+        else:
+            self.vertices[u].append((v,x))
+        if self.reverse[v] is None:
+            self.reverse[v] = [(u,x)]
+        else:
+            self.reverse[v].append((u,x))
+        self._invalidate(u)
+
+    def remove_path(self, u: int, v: int, x: int|None = None) -> None:
+        """
+        Function Description:
+            Removes a path from u to v, the first one found if there are several.
+
+        Approach Description:
+            Removes (v,x) from the edges of u and (u,x) from the reverse edges of v, storing None 
+            again if no edges are left, as in init. Only cached results whose search reached u can 
+            change, as any route using this path goes through u.
+
+        Input:
+            u, v: vertices of the path
+            x: time of the path, or None to remove a path from u to v of any time
+
+        Time Complexity: O(D) where D is the number of edges of u and v
+        Space Complexity: O(1)
+        """
+        self._before_update()
+        edges = self.vertices[u] if u < len(self.vertices) else None
+        for i, (w, y) in enumerate(edges or ()):
+            if w == v and (x is None or y == x):
+                break
+        else:
+            raise ValueError("no path from " + str(u) + " to " + str(v))
+        del edges[i]
+        if len(edges) == 0:
+            self.vertices[u] = None
+        self.reverse[v].remove((u,y))
+        if len(self.reverse[v]) == 0:
+            self.reverse[v] = None
+        self._invalidate(u)
+
+    def set_key(self, u: int, y: int|float) -> None:
+        """
+        Function Description:
+            Sets the time to obtain the key at vertex u, inf to remove the key.
+
+        Approach Description:
+            Only cached results whose search reached u can change.
+
+        Input:
+            u: vertex ID
+            y: time to obtain the key in mins, or inf
+
+        Time Complexity: O(1), plus the size of the cached searches invalidated
+        Space Complexity: O(1)
+        """
+        self._before_update()
+        self.keys[u] = y
+        self._invalidate(u)
+
+    def climb_cached(self, start: int, exits: list[int]) -> tuple[int, list[int]]|None:
+        """
+        Function Description:
+            Same as climb, but stores the result so the same query is answered again without a
+            search, until a change of the floor may affect it.
+
+        Approach Description:
+            The result is stored in self.cache with the vertices touched by its search, which are 
+            the vertices reached in either layer in less time than the result (all of them 
+            settled before the exit). A path or key can only change the result if a route reaches 
+            its vertex u in that time, so self.cache_index maps every touched vertex to the queries 
+            that touched it, and add_path, remove_path and set_key only drop the queries in 
+            cache_index[u].
+
+        Input:
+            start, exits: as stated in climb
+
+        Output:
+            as stated in climb
+
+        Time Complexity: O(|exits|) if cached, O(E*log(V)) otherwise
+        Space Complexity: O(V) for every cached query
+        """
+        query = start, tuple(sorted(set(exits)))
+        if query in self.cache:
+            return self.cache[query][0]
+        end, distance, predecessor = self._search(start, exits, None)
+        n = len(self.vertices)
+        if end is None:                                         # if no possible paths
+            result, total_time = None, inf
+        else:
+            result = distance[end], self._layered_route(predecessor, end)
+            total_time = distance[end]
+        touched = []
+        for v in range(n):
+            time = min(distance[v], distance[v+n])
+            if time <= total_time and time < inf:
+                touched.append(v)
+        self.cache[query] = result, touched
+        for v in touched:
+            if v in self.cache_index:
+                self.cache_index[v].add(query)
+            else:
+                self.cache_index[v] = {query}
+        return result
+
+    def _invalidate(self, u: int) -> None:
+        """
+        Function Description:
+            Drops the cached queries whose search touched vertex u, refer to climb_cached.
+
+        Time Complexity: O(T) where T is the number of vertices touched by the dropped queries
+        Space Complexity: O(1)
+        """
+        for query in self.cache_index.pop(u, ()):
+            for v in self.cache.pop(query)[1]:
+                if v != u:
+                    self.cache_index[v].discard(query)
+
+    def _before_update(self) -> None:
+        """
+        Function Description:
+            Raises ValueError if the floor uses the csr layout, which cannot grow in place.
+            Otherwise drops the table of precompute, which is no longer valid.
+
+        Time Complexity: O(1)
+        Space Complexity: O(1)
+        """
+        if isinstance(self.vertices, csradjacency):
+            raise ValueError("updates need the list layout")
+        self.table = None
+
+    def __getstate__(self) -> dict:
+        """
+        Function Description:
+            State of the floor for pickle, as sent to worker processes, without the results of
+            climb_cached and the table of precompute, which a memory mapped table would copy 
+            whole.
+
+        Time Complexity: O(1)
+        Space Complexity: O(1)
+        """
+        state = self.__dict__.copy()
+        state["cache"], state["cache_index"], state["table"] = {}, {}, None
+        return state
+
+    def floor_hash(self) -> str:
+        """
+        Function Description:
+            Returns a hash of the paths and keys of the floor, which names its precompute files.
+
+        Approach Description:
+            SHA-256 of the text of the edges of every vertex, in order, and the keys, so it is the 
+            same for both layouts and changes with any update.
+
+        Time Complexity: O(V+E), where V is the vertices and E is the edges in the graph
+        Space Complexity: O(V+E), where V is the vertices and E is the edges in the graph
+        """
+        digest = sha256()
+        for u in range(len(self.vertices)):
+            digest.update(repr(list(self.vertices[u] or ())).encode())
+        digest.update(repr(self.keys).encode())
+        return digest.hexdigest()
+
+    def precompute(self, directory: str, processes: int|None = None) -> str:
+        """
+        Function Description:
+            Computes the shortest time from every vertex to every vertex as an exit, so climb can
+            answer from the table without a search. The table is stored in files in directory, 
+            and loaded instead of computed if the files of the same floor are already there.
+
+        Approach Description:
+            Requires NumPy. For every vertex as start, the search of climb is run with no exits, 
+            so it reaches every state. Row start of the time table is then the time of every vertex
+            in layer 1, which is the time of the floor if that vertex is the exit, and row start
+            of the predecessor table is the predecessor of every state, -1 for none, from which
+            _layered_route can trace the route. Each start is one task of a process pool, and the 
+            rows are written as they finish to .npy files opened with memory mapping, so the 
+            tables do not need to fit in memory. The files are named by floor_hash, and written 
+            under a temporary name unique to this call then renamed, so a complete table is never
+            mixed with an unfinished one or another floor, even when several processes compute 
+            the same floor at once. The tables are kept memory mapped in self.table, 
+            so a worker only reads the rows it uses.
+
+        Input:
+            directory: folder of the table files
+            processes: number of processes, None for the number of CPUs, 1 to run in this process
+
+        Output:
+            path of the time table file
+
+        Time Complexity: O(V*E*log(V)), where V is the vertices and E is the edges in the graph,
+                         O(1) if the files exist
+        Space Complexity: O(V^2) on disk, 16 bytes for every pair of vertices
+        """
+        import numpy as np
+        n = len(self.vertices)
+        name = os.path.join(directory, "floor_" + self.floor_hash())
+        if not os.path.exists(name + "_time.npy"):
+            temporary = []
+            for table in ("_time", "_pred"):
+                handle, path = tempfile.mkstemp(".tmp", os.path.basename(name) + table + "_", directory)
+                os.close(handle)
+                temporary.append(path)
+            try:
+                times = np.lib.format.open_memmap(temporary[0], "w+", np.float64, (n, n))
+                preds = np.lib.format.open_memmap(temporary[1], "w+", np.int32, (n, 2*n))
+                if processes == 1:
+                    rows = map(_table_row, [self]*n, range(n))
+                    for start, (time_row, pred_row) in enumerate(rows):
+                        times[start], preds[start] = time_row, pred_row
+                else:
+                    with ProcessPoolExecutor(processes, initializer=_set_table_floor, 
+                                             initargs=(self,)) as pool:
+                        rows = pool.map(_table_row, [None]*n, range(n), chunksize=max(n//256, 1))
+                        for start, (time_row, pred_row) in enumerate(rows):
+                            times[start], preds[start] = time_row, pred_row
+                times.flush()
+                preds.flush()
+                del times, preds
+                os.replace(temporary[1], name + "_pred.npy")        # time table last, as it marks
+                os.replace(temporary[0], name + "_time.npy")        # the files as complete
+            finally:
+                for path in temporary:                              # left only if it failed
+                    if os.path.exists(path):
+                        os.remove(path)
+        self.table = np.load(name + "_time.npy", mmap_mode="r"), np.load(name + "_pred.npy", mmap_mode="r")
+        return name + "_time.npy"
+
+class Tower:
+
+    def __init__(self, floors: list[FloorGraph], exits: list[list[int]], 
+                 links: list[dict[int, int]]|None = None) -> None:
+        """
+        Function Description:
+            A tower of floors, where leaving floor i by one of its exits takes you to a start of 
+            floor i+1. Finds the shortest time to clear every floor, reusing the routes of each 
+            floor until that floor changes.
+
+        Approach Description:
+            The floors are stored in order with their exits. links[i] maps every exit of floor i
+            to the start vertex of floor i+1 it leads to, by default the same vertex ID.
+            self.memo maps (floor index, start vertex) to the time and route from that start to 
+            every exit of the floor, so only floors that changed are searched again.
+
+        Input:
+            floors: list of FloorGraph, from the bottom floor
+            exits: list of the exit vertices of every floor
+            links: list of dict of exit of floor i to start of floor i+1, None for the same IDs
+
+        Output:
+            None
+
+        Time Complexity: O(F), where F is the number of floors
+        Space Complexity: O(F), where F is the number of floors
+        """
+        self.floors = floors
+        self.exits = exits
+        self.links = links if links is not None else [{} for _ in floors]
+        self.memo = {}                                   # (floor, start) -> results of every exit
+
+    def climb(self, start: int, processes: int|None = None) -> tuple[int, list[list[int]]]|None:
+        """
+        Function Description:
+            Finds the shortest time to clear every floor of the tower from start on the bottom 
+            floor, with the route taken on every floor.
+
+        Approach Description:
+            The possible starts of floor i+1 are the links of the exits of floor i, so all 
+            (floor, start) pairs are known before searching, and their searches are independent.
+            Those not in self.memo are searched in a process pool, one task each, where a task
+            runs the search of climb from the start to every exit of its floor. The floors are 
+            sent once per worker process by its initialiser, not with every task. Floors with a 
+            table from precompute are answered from it in this process instead.
+            Then, from the top floor down, best[i][start] is the shortest time from start on 
+            floor i to the top, the minimum over the exits e of floor i of the time from start to
+            e plus best[i+1] of the link of e. Remembering the exit chosen for every start gives 
+            the route of every floor from the bottom up.
+
+        Input:
+            start: starting vertex ID of the bottom floor
+            processes: number of processes, None for the number of CPUs, 1 to run in this process
+
+        Output:
+            total_time: shortest time taken to clear every floor in mins
+            routes: list of the route taken on every floor
+            None if there is no possible path
+
+        Time Complexity: O(F*X*E*log(V)) for the floors searched, where F is the number of floors,
+                         X the number of exits of a floor, V the vertices and E the edges of a floor
+        Space Complexity: O(F*X*V), for the memoised routes
+        """
+        starts = [[start]]
+        for i in range(len(self.floors) - 1):
+            starts.append(sorted({self.links[i].get(exit, exit) for exit in self.exits[i]}))
+        tasks = [(i, entry) for i in range(len(self.floors)) for entry in starts[i] 
+                 if (i, entry) not in self.memo]
+        local = [(i, entry) for i, entry in tasks if self.floors[i].table is not None]
+        searched = [(i, entry) for i, entry in tasks if self.floors[i].table is None]
+        if processes == 1 or len(searched) < 2:
+            local, searched = tasks, []
+        results = map(_floor_routes, [self.floors[i] for i, _ in local], 
+                      [entry for _, entry in local], [self.exits[i] for i, _ in local])
+        self.memo.update(zip(local, results))
+        if searched:
+            floors = {i: self.floors[i] for i, _ in searched}
+            with ProcessPoolExecutor(processes, initializer=_set_tower_floors, initargs=(floors,)) as pool:
+                results = pool.map(_floor_routes, [i for i, _ in searched], 
+                                   [entry for _, entry in searched], [self.exits[i] for i, _ in searched])
+                self.memo.update(zip(searched, results))
+        best = {}                                        # (floor, start) -> (time, exit)
+        for i in range(len(self.floors) - 1, -1, -1):
+            for entry in starts[i]:
+                time, chosen = inf, None
+                for exit, result in zip(self.exits[i], self.memo[(i, entry)]):
+                    if result is None:
+                        continue
+                    rest = 0
+                    if i + 1 < len(self.floors):
+                        rest = best[(i+1, self.links[i].get(exit, exit))][0]
+                    if result[0] + rest < time:
+                        time, chosen = result[0] + rest, exit
+                best[(i, entry)] = time, chosen
+        total_time = best[(0, start)][0]
+        if total_time is inf:                            # if no possible paths
+            return None
+        routes, entry = [], start
+        for i in range(len(self.floors)):
+            exit = best[(i, entry)][1]
+            routes.append(self.memo[(i, entry)][self.exits[i].index(exit)][1])
+            entry = self.links[i].get(exit, exit)
+        return total_time, routes
+
+    def replace_floor(self, i: int, floor: FloorGraph, exits: list[int]|None = None) -> None:
+        """
+        Function Description:
+            Replaces floor i, and its exits if given, so the next climb only searches floor i again.
+
+        Input:
+            i: index of the floor
+            floor: the new FloorGraph
+            exits: the new exits of the floor, None to keep them
+
+        Time Complexity: O(M), where M is the number of memoised results
+        Space Complexity: O(1)
+        """
+        self.floors[i] = floor
+        if exits is not None:
+            self.exits[i] = exits
+        self.invalidate(i)
+
+    def invalidate(self, i: int) -> None:
+        """
+        Function Description:
+            Drops the memoised results of floor i, to be called after changing it in place, such
+            as with FloorGraph.add_path.
+
+        Input:
+            i: index of the floor
+
+        Time Complexity: O(M), where M is the number of memoised results
+        Space Complexity: O(1)
+        """
+        for floor, entry in list(self.memo):
+            if floor == i:
+                del self.memo[(floor, entry)]
+
+def _floor_routes(floor: FloorGraph|int, start: int, 
+                  exits: list[int]) -> list[tuple[int, list[int]]|None]:
+    """
+    Function Description:
+        Task of Tower.climb, the time and route from start to every exit of floor, in the order 
+        of exits, with None for exits that cannot be reached.
+
+    Approach Description:
+        If the floor has a table from precompute, the results are read from row start of it, 
+        as in FloorGraph._climb_table. Otherwise one search of climb with no exits reaches every
+        state, so it gives the result of every exit at once.
+
+    Input:
+        floor: the FloorGraph, or its index in the floors set by _set_tower_floors
+        start: vertex ID
+        exits: exit vertex IDs
+
+    Time Complexity: O(E*log(V)), where V is the vertices and E is the edges in the graph,
+                     O(X*V) with a table, where X is the number of exits
+    Space Complexity: O(V), where V is the vertices
+    """
+    if isinstance(floor, int):
+        floor = _tower_floors[floor]
+    n = len(floor.vertices)
+    results = []
+    if floor.table is not None:
+        times, preds = floor.table
+        for exit in exits:
+            if times[start, exit] == inf:
+                results.append(None)
+            else:
+                results.append((int(times[start, exit]), floor._layered_route(preds[start], exit + n)))
+        return results
+    distance, predecessor = floor._search(start, [], None)[1:]
+    for exit in exits:
+        if distance[exit + n] is inf:
+            results.append(None)
+        else:
+            results.append((distance[exit + n], floor._layered_route(predecessor, exit + n)))
+    return results
+
+_tower_floors = None                                    # floors of Tower.climb in a worker process
+
+def _set_tower_floors(floors: dict[int, FloorGraph]) -> None:
+    """Initialiser of the Tower.climb workers, so every floor is sent once per process"""
+    global _tower_floors
+    _tower_floors = floors
+
+_table_floor = None                                     # FloorGraph of precompute in a worker process
+
+def _set_table_floor(floor: FloorGraph) -> None:
+    """Initialiser of the precompute workers, so the floor is sent once per process"""
+    global _table_floor
+    _table_floor = floor
+
+def _table_row(floor: FloorGraph|None, start: int) -> tuple[list, list]:
+    """
+    Function Description:
+        Computes row start of the tables of FloorGraph.precompute, refer to precompute.
+
+    Input:
+        floor: the FloorGraph, or None for the one set by _set_table_floor
+        start: vertex ID
+
+    Output:
+        time of every vertex in layer 1, and predecessor of every state with -1 for none
+
+    Time Complexity: O(E*log(V)), where V is the vertices and E is the edges in the graph
+    Space Complexity: O(V), where V is the vertices
+    """
+    if floor is None:
+        floor = _table_floor
+    distance, predecessor = floor._search(start, [], None)[1:]
+    return distance[len(floor.vertices):], [-1 if pred is None else pred for pred in predecessor]
+
+class csradjacency():
+
+    def __init__(self, paths: list[tuple[int, int, int]], size: int, reverse: bool) -> None:
+        """
+        Function Description:
+            Compressed sparse row storage of the edges of a FloorGraph, as an alternative to the
+            list of lists of (v,x) tuples. Indexing a vertex gives its edges as (v,x) pairs, or None
+            if it has no edges, the same as the list layout.
+
+        Approach Description:
+            The edges of vertex u are targets[offsets[u]:offsets[u+1]] with the matching weights,
+            all stored in array('i'), so an edge costs 8 bytes instead of a tuple object.
+            The first pass over paths counts the edges of every vertex, and the prefix sum of
+            the counts gives the offsets. The second pass places every edge at the next free slot
+            of its vertex, which keeps the edges in the order given by paths.
+
+        Input:
+            paths: as stated in FloorGraph init, weights must fit in a C int
+            size: number of vertices
+            reverse: if True, stores every path v to u instead of u to v
+
+        Output:
+            None
+
+        Time Complexity: O(V+E), where V is the vertices and E is the edges in the graph
+        Space Complexity: O(V+E), where V is the vertices and E is the edges in the graph
+        """
+        tail, head = (1, 0) if reverse else (0, 1)
+        self.offsets = array('i', bytes(4*(size+1)))
+        for path in paths:                                      # count edges of every vertex
+            self.offsets[path[tail]+1] += 1
+        for u in range(size):                                   # prefix sum gives the offsets
+            self.offsets[u+1] += self.offsets[u]
+        self.targets = array('i', bytes(4*len(paths)))
+        self.weights = array('i', bytes(4*len(paths)))
+        free = self.offsets[:-1]                                # next free slot of every vertex
+        for path in paths:
+            i = free[path[tail]]
+            self.targets[i] = path[head]
+            self.weights[i] = path[2]
+            free[path[tail]] = i + 1
+
+    def __len__(self) -> int:
+        """
+        Function Description:
+            Number of vertices
+
+        Time Complexity: O(1)
+        Space Complexity: O(1)
+        """
+        return len(self.offsets)-1
+
+    def __getitem__(self, u: int) -> zip|None:
+        """
+        Function Description:
+            Returns the edges of vertex u as (v,x) pairs, None if there are none
+
+        Input:
+            u: vertex ID
+        Output:
+            iterator of (v,x), or None
+        Time Complexity: O(D) where D is the number of edges of u, to slice the arrays
+        Space Complexity: O(D) where D is the number of edges of u
+        """
+        start, end = self.offsets[u], self.offsets[u+1]
+        if start == end:
+            return None
+        return zip(self.targets[start:end], self.weights[start:end])
+
+    def nbytes(self) -> int:
+        """
+        Function Description:
+            Returns the number of bytes held by the arrays
+
+        Time Complexity: O(1)
+        Space Complexity: O(1)
+        """
+        return sum(a.itemsize*len(a) for a in (self.offsets, self.targets, self.weights))
 
 class minheap():
 
-    def __init__(self, point: tuple[int, int]) -> None:
+    def __init__(self, point: tuple[int, int]|None, size: int = 0) -> None:
         """
         Function Description:
             Modified minimum heap data stucture as priority queue for usage in FloorGraph init. 
@@ -184,16 +1293,22 @@ class minheap():
 
         Approach Description:
             Simple min heap structure learned in FIT1008. First element is not used. 
+            Pushes, pops and the largest size reached are counted for stats().
 
         Input: 
-            point: tuple of two int, first being vertex ID and second being distance travelled in mins
+            point: tuple of two int, first being vertex ID and second being distance travelled in mins,
+                   or None to start with an empty heap
+            size: unused, accepted so it can be swapped with indexedminheap as FloorGraph.queue_type
         
             Output: None
 
         Time Complexity: O(1)
         Space Complexity: O(1)
         """
-        self.heap = [None, point]
+        self.heap = [None]
+        self.pushes, self.pops, self.max_size = 0, 0, 0
+        if point is not None:
+            self.push(point)
     
     def is_empty(self) -> bool:
         """
@@ -236,6 +1351,9 @@ class minheap():
         """
         self.heap.append(point)
         self._rise(len(self))
+        self.pushes += 1
+        if len(self) > self.max_size:
+            self.max_size = len(self)
     
     def pop(self) -> tuple[int, int]:
         """
@@ -255,7 +1373,36 @@ class minheap():
         del self.heap[-1]
         if not self.is_empty():    
             self._sink(1)
+        self.pops += 1
         return min
+
+    def peek(self) -> tuple[int, int]:
+        """
+        Function Description:
+            Returns the prioritized element in the heap (min distance) without deleting it
+
+        Input: None
+        Output: 
+            min: point with the smallest distance 
+        Time Complexity: O(1)
+        Space Complexity: O(1)
+        """
+        if self.is_empty():
+            raise IndexError
+        return self.heap[1]
+
+    def stats(self) -> dict[str, int]:
+        """
+        Function Description:
+            Returns the counters of the heap
+
+        Input: None
+        Output:
+            dict of the number of pushes, pops and the largest number of elements held at once
+        Time Complexity: O(1)
+        Space Complexity: O(1)
+        """
+        return {"pushes": self.pushes, "pops": self.pops, "max_size": self.max_size}
     
     def _rise(self, k: int) -> None:
         """
@@ -311,4 +1458,162 @@ class minheap():
         if 2*k == len(self) or self.heap[2*k][1] < self.heap[2*k+1][1]:
             return 2*k
         else:
-            return 2*k+1
\ No newline at end of file
+            return 2*k+1
+
+class indexedminheap(minheap):
+
+    def __init__(self, point: tuple[int, int]|None, size: int) -> None:
+        """
+        Function Description:
+            Min heap of vertices with a position map, so a vertex is held at most once and its 
+            distance can be changed in place. Used as the priority queue of FloorGraph.
+
+        Approach Description:
+            Same array layout as minheap, with self.position[v] being the index of vertex v in 
+            the heap, or 0 if v is not in the heap. Every move of an element in _rise and _sink 
+            also updates the position map. Pushing a vertex already in the heap changes its 
+            distance instead of adding a duplicate, so the heap never holds more than size elements.
+
+        Input: 
+            point: tuple of two int, first being vertex ID and second being distance travelled in mins,
+                   or None to start with an empty heap
+            size: number of vertices, vertex IDs are 0 to size-1
+
+        Output: None
+
+        Time Complexity: O(V), where V is size
+        Space Complexity: O(V), where V is size
+        """
+        self.position = [0]*size
+        self.decreases = 0
+        super().__init__(point)
+
+    def __contains__(self, vertex: int) -> bool:
+        """
+        Function Description:
+            Checks if vertex is in the heap
+
+        Input:
+            vertex: vertex ID
+        Output:
+            bool, True if vertex is in the heap, False otherwise
+        Time Complexity: O(1)
+        Space Complexity: O(1)
+        """
+        return self.position[vertex] != 0
+
+    def push(self, point: tuple[int, int]) -> None:
+        """
+        Function Description:
+            Adds a vertex in the heap, or changes its distance if it is already in the heap
+
+        Input:
+            point: as stated in __init__
+        Output:
+            None
+        Time Complexity: O(log(n)) where n is the number of element in the heap
+        Space Complexity: O(1)
+        """
+        k = self.position[point[0]]
+        if k == 0:
+            super().push(point)
+        elif point[1] < self.heap[k][1]:
+            self.decrease_key(point[0], point[1])
+        else:                                     # distance increased, sink instead
+            self.heap[k] = point
+            self._sink(k)
+
+    def decrease_key(self, vertex: int, distance: int) -> None:
+        """
+        Function Description:
+            Lowers the distance of a vertex already in the heap
+
+        Input:
+            vertex: vertex ID, must be in the heap
+            distance: new distance, not greater than the current one
+        Output:
+            None
+        Time Complexity: O(log(n)) where n is the number of element in the heap
+        Space Complexity: O(1)
+        """
+        k = self.position[vertex]
+        if k == 0:
+            raise KeyError(vertex)
+        self.heap[k] = (vertex, distance)
+        self._rise(k)
+        self.decreases += 1
+
+    def pop(self) -> tuple[int, int]:
+        """
+        Function Description:
+            Returns the vertex with the min distance and deletes it from the heap
+
+        Input: None
+        Output: 
+            min: point with the smallest distance 
+        Time Complexity: O(log(n)) where n is the number of element in the heap
+        Space Complexity: O(1)
+        """
+        min = super().pop()
+        self.position[min[0]] = 0
+        return min
+
+    def stats(self) -> dict[str, int]:
+        """
+        Function Description:
+            Returns the counters of the heap, as in minheap, with the number of decrease_key calls
+
+        Input: None
+        Output:
+            dict of the counters
+        Time Complexity: O(1)
+        Space Complexity: O(1)
+        """
+        stats = super().stats()
+        stats["decreases"] = self.decreases
+        return stats
+
+    def _rise(self, k: int) -> None:
+        """
+        Function Description:
+            Rise element to its correct position, updating the position map
+
+        Input: 
+            k: index of the element in the wrong position
+        Output:
+            None
+        Time Complexity: O(log(n)) where n is the number of element in the heap
+        Space Complexity: O(1)
+        """
+        point = self.heap[k]
+        while k > 1 and point[1] < self.heap[k//2][1]:
+            self.heap[k] = self.heap[k//2]
+            self.position[self.heap[k][0]] = k
+            k = k//2
+        self.heap[k] = point
+        self.position[point[0]] = k
+
+    def _sink(self, k: int) -> None:
+        """
+        Function Description:
+            Sink an element to its correct position, updating the position map
+
+        Input:
+            k: index of element in the wrong position
+        Output:
+            None
+        Time Complexity: O(log(n)) where n is the number of element in the heap
+        Space Complexity: O(1)
+        """
+        point = self.heap[k]
+        while 2*k <= len(self):
+            min_child = self.smallest_child(k)
+            if self.heap[min_child][1] >= point[1]:
+                break
+            self.heap[k] = self.heap[min_child]
+            self.position[self.heap[k][0]] = k
+            k = min_child
+        self.heap[k] = point
+        self.position[point[0]] = k
+
+FloorGraph.queue_type = indexedminheap
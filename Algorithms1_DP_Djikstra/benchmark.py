@@ -0,0 +1,371 @@
+import argparse
+import json
+import os
+import platform
+from random import Random
+from time import perf_counter
+import tracemalloc
+from assignment1 import FloorGraph, RestaurantStream, minheap, restaurantFinder, restaurantFinderMany
+
+class LazyFloorGraph(FloorGraph):
+    queue_type = minheap                     # push-only heap, duplicates an entry on every update
+
+def random_road(sites: int, seed: int = 0) -> list[int]:
+    """
+    Function Description:
+        Generates random revenues of a road, as the site_list input of restaurantFinder.
+
+    Input:
+        sites: number of sites
+        seed: seed of the random generator, so runs are repeatable
+
+    Output:
+        site_list
+    """
+    rng = Random(seed)
+    return [rng.randint(0, 1000) for _ in range(sites)]
+
+def random_floor(vertices: int, edges: int, keys: int, seed: int = 0) -> tuple[list, list]:
+    """
+    Function Description:
+        Generates a random floor with the given number of vertices, edges and keys, as the
+        paths and keys inputs of FloorGraph. A cycle through every vertex is always included
+        so every vertex can reach every other.
+
+    Input:
+        vertices, edges, keys: size of the floor
+        seed: seed of the random generator, so runs are repeatable
+
+    Output:
+        paths, keys: inputs of FloorGraph
+    """
+    rng = Random(seed)
+    paths = [(u, (u+1) % vertices, rng.randint(1, 100)) for u in range(vertices)]
+    for _ in range(max(edges - vertices, 0)):
+        paths.append((rng.randrange(vertices), rng.randrange(vertices), rng.randint(1, 100)))
+    key_list = [(k, rng.randint(0, 100)) for k in rng.sample(range(vertices), keys)]
+    return paths, key_list
+
+def grid_floor(width: int, height: int, keys: int, seed: int = 0) -> tuple[list, list]:
+    """
+    Function Description:
+        Generates a grid floor where every cell has paths to its 4 neighbours, each taking at
+        least 1 min, so the Manhattan distance is a lower bound of the time between two cells.
+        Vertex ID of cell (x, y) is y*width + x.
+
+    Input:
+        width, height: size of the grid
+        keys: number of keys
+        seed: seed of the random generator, so runs are repeatable
+
+    Output:
+        paths, keys: inputs of FloorGraph
+    """
+    rng = Random(seed)
+    paths = []
+    for y in range(height):
+        for x in range(width):
+            u = y*width + x
+            if x+1 < width:
+                paths += [(u, u+1, rng.randint(1, 10)), (u+1, u, rng.randint(1, 10))]
+            if y+1 < height:
+                paths += [(u, u+width, rng.randint(1, 10)), (u+width, u, rng.randint(1, 10))]
+    key_list = [(k, rng.randint(0, 10)) for k in rng.sample(range(width*height), keys)]
+    return paths, key_list
+
+def scale_free_floor(vertices: int, degree: int, keys: int, seed: int = 0) -> tuple[list, list]:
+    """
+    Function Description:
+        Generates a scale-free floor by preferential attachment: every new vertex adds paths to
+        and from degree earlier vertices, picked with probability proportional to their number
+        of paths, so a few vertices become hubs.
+
+    Input:
+        vertices: number of vertices, more than degree
+        degree: number of earlier vertices every new vertex is connected to
+        keys: number of keys
+        seed: seed of the random generator, so runs are repeatable
+
+    Output:
+        paths, keys: inputs of FloorGraph
+    """
+    rng = Random(seed)
+    paths, ends = [], list(range(degree))           # every vertex once per path it has
+    for u in range(degree, vertices):
+        targets = set()
+        while len(targets) < degree:
+            targets.add(rng.choice(ends))
+        for v in targets:
+            paths += [(u, v, rng.randint(1, 100)), (v, u, rng.randint(1, 100))]
+            ends += [u, v]
+    key_list = [(k, rng.randint(0, 100)) for k in rng.sample(range(vertices), keys)]
+    return paths, key_list
+
+def dense_floor(vertices: int, density: float, keys: int, seed: int = 0) -> tuple[list, list]:
+    """
+    Function Description:
+        Generates a dense floor where every ordered pair of vertices has a path with probability
+        density, plus a cycle through every vertex.
+
+    Input:
+        vertices: number of vertices
+        density: probability of a path between two vertices, 0 to 1
+        keys: number of keys
+        seed: seed of the random generator, so runs are repeatable
+
+    Output:
+        paths, keys: inputs of FloorGraph
+    """
+    rng = Random(seed)
+    paths = [(u, (u+1) % vertices, rng.randint(1, 100)) for u in range(vertices)]
+    for u in range(vertices):
+        for v in range(vertices):
+            if u != v and rng.random() < density:
+                paths.append((u, v, rng.randint(1, 100)))
+    key_list = [(k, rng.randint(0, 100)) for k in rng.sample(range(vertices), keys)]
+    return paths, key_list
+
+def measure(function: callable, *args) -> tuple[object, dict]:
+    """
+    Function Description:
+        Calls function with args, measuring the time taken and the peak memory allocated during 
+        the call with tracemalloc. Tracing slows down the call, so the time is measured in a 
+        separate untraced call first.
+
+    Output:
+        result of the call, and dict of the time in seconds and peak memory in bytes
+    """
+    time = perf_counter()
+    result = function(*args)
+    time = perf_counter() - time
+    tracemalloc.start()
+    function(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, {"time": time, "peak_memory": peak}
+
+def bench_restaurant(sizes: list[int], d: int = 5, seed: int = 0) -> dict:
+    """
+    Function Description:
+        Measures restaurantFinder and RestaurantStream on random roads of every size.
+
+    Output:
+        dict of measurements for every size
+    """
+    results = {}
+    for size in sizes:
+        site_list = random_road(size, seed)
+        results[str(size)] = {"restaurantFinder": measure(restaurantFinder, d, site_list)[1],
+                              "RestaurantStream": measure(_stream_road, d, site_list)[1]}
+    return results
+
+def _stream_road(d: int, site_list: list[int]) -> tuple[int, list]:
+    """Runs a road through RestaurantStream, for bench_restaurant"""
+    stream = RestaurantStream(d)
+    for _ in stream.run(site_list):
+        pass
+    return stream.total_revenue, stream.selected_sites()
+
+def bench_climb(floors: dict[str, tuple[list, list]], queries: int = 10, seed: int = 0) -> dict:
+    """
+    Function Description:
+        Measures construction and climb on every floor, with the heap counters and settled 
+        states of climb summed over all queries.
+
+    Input:
+        floors: dict of name to (paths, keys)
+
+    Output:
+        dict of measurements for every floor
+    """
+    rng = Random(seed)
+    results = {}
+    for name, (paths, keys) in floors.items():
+        floor, build = measure(FloorGraph, paths, keys)
+        n = len(floor.vertices)
+        batch = [(rng.randrange(n), rng.sample(range(n), 3)) for _ in range(queries)]
+        counters = {"pushes": 0, "pops": 0, "max_size": 0, "settled": 0}
+        climb = {"time": 0.0, "peak_memory": 0}
+        for start, exits in batch:
+            stats = measure(floor.climb, start, exits)[1]
+            climb["time"] += stats["time"]
+            climb["peak_memory"] = max(climb["peak_memory"], stats["peak_memory"])
+            counters["pushes"] += floor.queue_stats["pushes"]
+            counters["pops"] += floor.queue_stats["pops"]
+            counters["max_size"] = max(counters["max_size"], floor.queue_stats["max_size"])
+            counters["settled"] += floor.settled
+        results[name] = {"vertices": n, "edges": len(paths), "build": build, 
+                         "climb": climb, "heap": counters}
+    return results
+
+def run(output: str, label: str, quick: bool = False) -> dict:
+    """
+    Function Description:
+        Runs the benchmarks of restaurantFinder and climb on seeded inputs and appends the 
+        results to the JSON file output under label, so runs of different versions of 
+        assignment1 can be compared in the same file.
+
+    Input:
+        output: path of the JSON file, a list of runs
+        label: name of this run, such as a version or commit
+        quick: smaller inputs, for a fast check
+
+    Output:
+        dict of the results of this run
+    """
+    scale = 10 if quick else 1
+    floors = {"grid": grid_floor(200//scale, 200//scale, 400//scale),
+              "scale_free": scale_free_floor(20000//scale, 3, 200//scale),
+              "dense": dense_floor(1000//scale, 0.2, 10)}
+    results = {"label": label, "python": platform.python_version(),
+               "restaurant": bench_restaurant([10**4//scale, 10**5//scale, 10**6//scale]),
+               "climb": bench_climb(floors)}
+    runs = []
+    if os.path.exists(output):
+        with open(output) as file:
+            runs = json.load(file)
+    runs.append(results)
+    with open(output, "w") as file:
+        json.dump(runs, file, indent=2)
+    return results
+
+def bench_climb_many(vertices: int = 2000, edges: int = 10000, queries: int = 200,
+                     exit_sets: int = 5, seed: int = 0) -> dict:
+    """
+    Function Description:
+        Compares the throughput of climb_many against calling climb in a loop on the same floor.
+        Queries share a small number of exit lists, as in a routing service for one floor.
+
+    Output:
+        dict of the timings in seconds and queries per second of both
+    """
+    rng = Random(seed)
+    paths, keys = random_floor(vertices, edges, max(vertices//100, 1), seed)
+    floor = FloorGraph(paths, keys)
+    exits = [rng.sample(range(vertices), 3) for _ in range(exit_sets)]
+    batch = [(rng.randrange(vertices), rng.choice(exits)) for _ in range(queries)]
+    time = perf_counter()
+    for start, exit_list in batch:
+        floor.climb(start, exit_list)
+    loop = perf_counter() - time
+    time = perf_counter()
+    floor.climb_many(batch)
+    many = perf_counter() - time
+    return {"climb_loop": loop, "climb_many": many,
+            "climb_loop_qps": queries/loop, "climb_many_qps": queries/many}
+
+def bench_queue(vertices: int = 300, edges: int = 30000, queries: int = 20, seed: int = 0) -> dict:
+    """
+    Function Description:
+        Compares climb with the indexed heap (decrease_key) against the lazy push-only minheap
+        on a dense floor, summing the heap counters over all queries.
+
+    Output:
+        dict of the time in seconds and summed heap counters of both
+    """
+    rng = Random(seed)
+    paths, keys = random_floor(vertices, edges, max(vertices//100, 1), seed)
+    batch = [(rng.randrange(vertices), rng.sample(range(vertices), 3)) for _ in range(queries)]
+    results = {}
+    for name, graph in (("indexed", FloorGraph), ("lazy", LazyFloorGraph)):
+        floor = graph(paths, keys)
+        total = {"time": 0.0, "pushes": 0, "pops": 0, "max_size": 0}
+        for start, exit_list in batch:
+            time = perf_counter()
+            floor.climb(start, exit_list)
+            total["time"] += perf_counter() - time
+            total["pushes"] += floor.queue_stats["pushes"]
+            total["pops"] += floor.queue_stats["pops"]
+            total["max_size"] = max(total["max_size"], floor.queue_stats["max_size"])
+        results[name] = total
+    return results
+
+def bench_layout(vertices: int = 100000, edges: int = 1000000, queries: int = 5, seed: int = 0) -> dict:
+    """
+    Function Description:
+        Compares the list and csr layouts of FloorGraph: memory held by the graph after
+        construction (measured with tracemalloc), construction time and climb time.
+
+    Output:
+        dict of the memory in bytes and times in seconds of both layouts
+    """
+    rng = Random(seed)
+    paths, keys = random_floor(vertices, edges, max(vertices//100, 1), seed)
+    batch = [(rng.randrange(vertices), rng.sample(range(vertices), 3)) for _ in range(queries)]
+    results = {}
+    for layout in ("list", "csr"):
+        tracemalloc.start()
+        time = perf_counter()
+        floor = FloorGraph(paths, keys, layout)
+        build = perf_counter() - time
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        time = perf_counter()
+        for start, exit_list in batch:
+            floor.climb(start, exit_list)
+        results[layout] = {"memory": memory, "build": build, "climb": perf_counter() - time}
+        del floor
+    return results
+
+def bench_search_modes(width: int = 200, height: int = 200, queries: int = 20, seed: int = 0) -> dict:
+    """
+    Function Description:
+        Compares the layered, bidirectional and astar modes of climb on a grid floor with one
+        exit close to start, using the Manhattan distance to the exit as heuristic.
+
+    Output:
+        dict of the time in seconds and settled states summed over all queries of every mode
+    """
+    rng = Random(seed)
+    paths, keys = grid_floor(width, height, width*height//50, seed)
+    floor = FloorGraph(paths, keys)
+    batch = []
+    for _ in range(queries):
+        x, y = rng.randrange(width - 20), rng.randrange(height - 20)
+        batch.append((y*width + x, (y + rng.randrange(20))*width + x + rng.randrange(20)))
+    results = {}
+    for mode in ("layered", "bidirectional", "astar"):
+        total = {"time": 0.0, "settled": 0}
+        for start, exit in batch:
+            def manhattan(v, exit=exit):
+                return abs(v % width - exit % width) + abs(v // width - exit // width)
+            time = perf_counter()
+            floor.climb(start, [exit], mode, manhattan)
+            total["time"] += perf_counter() - time
+            total["settled"] += floor.settled
+        results[mode] = total
+    return results
+
+def bench_restaurant_many(sites: int = 20000, ds: int = 50, seed: int = 0) -> dict:
+    """
+    Function Description:
+        Compares restaurantFinderMany against calling restaurantFinder once for every d.
+
+    Output:
+        dict of the timings in seconds of both
+    """
+    site_list = random_road(sites, seed)
+    distances = list(range(ds))
+    time = perf_counter()
+    for d in distances:
+        restaurantFinder(d, site_list)
+    loop = perf_counter() - time
+    time = perf_counter()
+    restaurantFinderMany(distances, site_list)
+    return {"restaurant_loop": loop, "restaurant_many": perf_counter() - time}
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("label", help="Name of this run in the results file, such as a commit.")
+    p.add_argument("-o", "--output", help="JSON results file.", default="benchmark_results.json")
+    p.add_argument("-q", "--quick", help="Run on smaller inputs.", action="store_true")
+    p.add_argument("-c", "--compare", help="Also run the comparisons between versions of "
+                   "the algorithms and print them.", action="store_true")
+    args = p.parse_args()
+    print(json.dumps(run(args.output, args.label, args.quick), indent=2))
+    if args.compare:
+        print(bench_climb_many())
+        print(bench_queue())
+        print(bench_layout())
+        print(bench_search_modes())
+        print(bench_restaurant_many())
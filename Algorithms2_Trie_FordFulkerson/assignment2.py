@@ -1,4 +1,14 @@
 from math import inf, ceil
+from array import array
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from heapq import heapify, heappop, heappush
+import mmap
+import os
+import re
+import sys
+
+SNAPSHOT_MAGIC = b"TRIESV2"                          # start of the files of Trie.save
 
 ### DO NOT CHANGE THIS FUNCTION
 def load_dictionary(filename):
@@ -21,10 +31,41 @@ def load_dictionary(filename):
             aList.append([word,definition,frequency])
 
     return aList
+
+RECORD = re.compile(rb"^word: ([^\n]*)\nfrequency: ([^\n]*)\ndefinition: ([^\n]*)", re.MULTILINE)
+
+def iter_dictionary(filename: str) -> Iterator[list[str, str, int]]:
+    """
+    Function Description:
+        Faster replacement of load_dictionary, yielding the [word, definition, frequency] entries 
+        one at a time instead of building the whole list.
+
+    Approach Description:
+        The file is memory mapped and a single regex, RECORD, finds every record of three lines 
+        in it, so the text is not split into lines or copied by replace. Only the matched groups
+        are decoded. As with load_dictionary, the word is stripped, and the definition is the 
+        rest of its line.
+
+    Input:
+        filename: path of the dictionary file
+
+    Output:
+        generator of [word, definition, frequency], in the order of the file
+
+    Time Complexity: O(T), where T is the number of characters in the file
+    Aux Space Complexity: O(L), where L is the length of the longest record
+    """
+    with open(filename, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as image:
+            for record in RECORD.finditer(image):
+                word, frequency, definition = record.groups()
+                yield [word.decode('utf-8').strip(), definition.decode('utf-8'), int(frequency)]
     
 class Trie:
 
-    def __init__(self, Dictionary: list[list[str, str, int]]) -> None:
+    def __init__(self, Dictionary: list[list[str, str, int]], layout: str = "list") -> None:
         """
         Function Description:
             Initialise the dictionary and trie. Record words in the dictionary into a trie for 
@@ -37,26 +78,173 @@ class Trie:
             As we don't need an end point marker '$', we replace that with a dictionary index for 
             current highest frequency word for that particular prefix. 
             We also record num_matches as we register the word in the trie.
+            One more index holds the first entry whose word ends at the node, None if none, and 
+            following[entry] the next entry of the same word, -1 if none, so the entries of a word
+            are found from its node without an index of the whole dictionary.
+            With layout "array", the nodes are stored in a TrieNodes instead, which keeps the same
+            information in flat arrays with only the edges that exist.
+            The 26 slots only hold a-z. With layout "dict", a node is [children, end, best, count]
+            instead, where children is a dict of character to child, so words can have any 
+            character, such as hyphens, apostrophes or accented letters, and a node only holds 
+            the edges that exist. TrieNodes also takes any character, with slower lookups.
+            The trie keeps its own copy of the list of entries, so insert and delete do not 
+            change Dictionary.
 
         Input:
             Dictionary: A list of list containing the string of the word, definition and 
             frequency of word used in int.
+            layout: "list" for a list of 29 slots per node, "array" for TrieNodes, "dict" for a 
+                    dict of edges per node
 
         Time Complexity: O(T), where T is the total number of characters in Dictionary.txt
         Aux Space Complexity: O(T), where T is the total number of characters in Dictionary.txt
         """
-        self.dictionary = Dictionary                  # word, def, freq
-        self.trie = [None for _ in range(27)] + [0]   # a-z, dictionary entry index, num_matches
-        for i, entry in enumerate(self.dictionary):
-            self.record_word(entry[0], 0, i, self.trie)
+        self.dictionary = list(Dictionary)            # word, def, freq, None once deleted
+        self.layout = layout
+        self.following = array('i')                   # next entry of the same word, -1 if none
+        self.deleted = 0                              # number of deleted entries
+        if layout == "list":
+            self.trie = [None for _ in range(28)] + [0]   # a-z, word entry, dictionary entry index, num_matches
+            for i, entry in enumerate(self.dictionary):
+                self.record_word(entry[0], 0, i, self.trie)
+        elif layout == "array":
+            self.trie = TrieNodes(self.dictionary)
+            self.following = self.trie.following
+            for i, entry in enumerate(self.dictionary):
+                self.trie.record_word(entry[0], i)
+        elif layout == "dict":
+            self.trie = [{}, None, None, 0]               # character -> child, word entry, dictionary entry index, num_matches
+            for i, entry in enumerate(self.dictionary):
+                self.record_word(entry[0], 0, i, self.trie)
+        else:
+            raise ValueError("unknown layout: " + str(layout))
+
+    @classmethod
+    def sharded(cls, Dictionary: list[list[str, str, int]], layout: str = "list", 
+                processes: int|None = None) -> "Trie":
+        """
+        Function Description:
+            Builds the same Trie as Trie(Dictionary, layout), with the words of every first 
+            letter recorded in parallel.
+
+        Approach Description:
+            Words with different first letters share no node but the root, so the dictionary is
+            split by first letter into shards, and every shard is one task of a process pool, 
+            which records it into a trie of its own with _shard_trie. Only the words and 
+            frequencies are sent to the workers, and only flat arrays come back, whatever the 
+            layout, as nested node lists cannot be pickled once words are a few hundred characters
+            long. The entries of the shards are mapped back to those of Dictionary, and the nodes 
+            of the shards appended to one TrieNodes, the node of the letter of every shard becoming
+            a child of the root, whose num_matches is the sum of those of its children and whose 
+            best entry is the best of theirs, ranked as in record_word. For layouts "list" and 
+            "dict", the nodes are then made from the arrays in a loop, parents first, as a child 
+            always comes after its parent in TrieNodes. Empty words, which have no first letter, 
+            are recorded into the root last.
+
+        Input:
+            Dictionary: A list of list containing the string of the word, definition and 
+            frequency of word used in int.
+            layout: "list" for a list of 29 slots per node, "array" for TrieNodes, "dict" for a 
+                    dict of edges per node
+            processes: number of processes, None for the number of CPUs, 1 to run in this process
+
+        Output:
+            the Trie
+
+        Time Complexity: O(T/P + N), where T is the total number of characters in Dictionary.txt,
+                         P the number of processes and N the number of nodes
+        Aux Space Complexity: O(T), where T is the total number of characters in Dictionary.txt
+        """
+        trie = cls([], layout)
+        trie.dictionary = list(Dictionary)
+        shards = {}                                             # first letter -> entries
+        for i, entry in enumerate(Dictionary):
+            shards.setdefault(entry[0][:1], []).append(i)
+        empty = shards.pop("", [])
+        letters = list(shards)
+        words = [[Dictionary[i][0] for i in shards[letter]] for letter in letters]
+        frequencies = [[Dictionary[i][2] for i in shards[letter]] for letter in letters]
+        entries = [shards[letter] for letter in letters]
+        if processes == 1 or len(letters) < 2:
+            subtries = list(map(_shard_trie, words, frequencies, entries))
+        else:
+            with ProcessPoolExecutor(processes) as pool:
+                subtries = list(pool.map(_shard_trie, words, frequencies, entries))
+        nodes = TrieNodes(trie.dictionary)
+        nodes.following = array('i', [-1]) * len(trie.dictionary)
+        for shard, (label, best, count, first, sibling, end, following) in zip(entries, subtries):
+            for i, entry in enumerate(shard):
+                nodes.following[entry] = following[i]
+            base = len(nodes.label)                             # node IDs of the shard move by base
+            nodes.label.extend(label)
+            nodes.best.extend(best)
+            nodes.count.extend(count)
+            nodes.first.extend(array('i', [-1 if node == -1 else node + base for node in first]))
+            nodes.sibling.extend(array('i', [-1 if node == -1 else node + base for node in sibling]))
+            nodes.end.extend(end)
+            nodes.sibling[base] = nodes.first[0]                # node of the letter joins the root
+            nodes.first[0] = base
+        trie.following = nodes.following
+        if layout == "array":
+            trie.trie = nodes
+        else:
+            made = [trie.trie] + [None] * (len(nodes.label) - 1)    # node of every node ID
+            for node in range(len(nodes.label)):
+                child = nodes.first[node]
+                while child != -1:
+                    end = None if nodes.end[child] == -1 else nodes.end[child]
+                    values = [end, nodes.best[child], nodes.count[child]]     # every node has words
+                    if layout == "dict":
+                        made[child] = [{}] + values
+                        made[node][0][chr(nodes.label[child])] = made[child]
+                    else:
+                        made[child] = [None]*26 + values
+                        made[node][nodes.label[child] - 97] = made[child]
+                    child = nodes.sibling[child]
+        root = trie._find("")
+        children = [child for _, child in trie._children(root)]
+        trie._add_count(root, sum(trie._count(child) for child in children))
+        trie._set_best(root, min((trie._best(child) for child in children), key=trie._rank, default=None))
+        for i in empty:
+            if layout == "array":
+                trie.trie.record_word("", i)
+            else:
+                trie.record_word("", 0, i, trie.trie)
+        return trie
+
+    def extend(self, entries: Iterable[list[str, str, int]]) -> None:
+        """
+        Function Description:
+            Adds entries to the dictionary and records their words, one at a time, so the trie can 
+            be fed from a generator such as iter_dictionary without holding the entries twice.
+
+        Input:
+            entries: iterable of [word, definition, frequency]
+
+        Time Complexity: O(T), where T is the total number of characters of the entries
+        Aux Space Complexity: O(T), where T is the total number of characters of the entries
+        """
+        self._before_update()
+        for entry in entries:
+            self.dictionary.append(entry)
+            if self.layout == "array":
+                self.trie.record_word(entry[0], len(self.dictionary) - 1)
+            else:
+                self.record_word(entry[0], 0, len(self.dictionary) - 1, self.trie)
 
     def record_word(self, word: str, index: int, entry: int, arr: list) -> None:
         """
         Function Description: 
-            Register a single letter from the index-th letter of input word into the trie.
+            Register the letters of input word from the index-th letter into the trie.
 
         Approach Description: 
-            Record the letter of each word one by one as described mostly in init and line comments.
+            Record the letter of each word one by one as described mostly in init and line comments,
+            moving one depth down the trie per letter in a loop.
+            All words below a node share the same prefix, so when frequencies are the same, 
+            comparing the whole words gives the same order as comparing what is left of them, 
+            without slicing a new string at every node.
+            The entry then goes first in the chain of entries ending at the last node.
+            With layout "dict", the next node is found in the dict of edges of the node instead.
 
         Input:
             word: string to be inputted into the trie
@@ -67,21 +255,36 @@ class Trie:
         Time Complexity: O(L) where L is the number of characters in the strings
         Aux Space Complexity: O(L) where L is the number of characters in the strings
         """
-        arr[-1] += 1                                                        # increase num_matches
-        if arr[-2] is None:                                                 # if there are no entries yet
-            arr[-2] = entry
-        elif arr[-2] != entry:
-            if self.dictionary[entry][2] > self.dictionary[arr[-2]][2]:     # compares frequency
+        frequency = self.dictionary[entry][2]
+        edges = self.layout == "dict"
+        while True:
+            arr[-1] += 1                                                    # increase num_matches
+            best = arr[-2]
+            if best is None:                                                # if there are no entries yet
                 arr[-2] = entry
-            elif self.dictionary[entry][2] == self.dictionary[arr[-2]][2]:  # compares string
-                if self.dictionary[entry][0][index:] < self.dictionary[arr[-2]][0][index:]: 
-                    arr[-2] = entry                                # compares lesser string each time
-        if len(word) == index:                                     # if there are no letters left
-            return
-        arr_index = ord(word[index]) - 97
-        if arr[arr_index] is None:                                 # creates array if no entries yet
-            arr[arr_index] = [None for _ in range(27)] + [0]
-        self.record_word(word, index+1, entry, arr[arr_index])     # calls itself with updated parameters
+            elif best != entry:
+                if frequency > self.dictionary[best][2]:                    # compares frequency
+                    arr[-2] = entry
+                elif frequency == self.dictionary[best][2]:                 # compares string
+                    if word < self.dictionary[best][0]:
+                        arr[-2] = entry
+            if len(word) == index:                                 # if there are no letters left
+                while len(self.following) <= entry:
+                    self.following.append(-1)
+                self.following[entry] = -1 if arr[-3] is None else arr[-3]
+                arr[-3] = entry                                    # word ends here
+                return
+            if edges:
+                child = arr[0].get(word[index])
+                if child is None:                                  # creates node if no entries yet
+                    child = arr[0][word[index]] = [{}, None, None, 0]
+                arr = child                                        # moves to the next depth
+            else:
+                arr_index = ord(word[index]) - 97
+                if arr[arr_index] is None:                         # creates array if no entries yet
+                    arr[arr_index] = [None]*28 + [0]
+                arr = arr[arr_index]                               # moves to the next depth
+            index += 1
     
     def prefix_search(self, prefix: str) -> list[str|None, str|None, int]:
         """
@@ -104,14 +307,20 @@ class Trie:
         Time Complexity: O(M+N) 
         Aux Space Complexity: O(M+N)
         """
-        result = self.prefix_search_aux(prefix, 0, self.trie)
-        if result is None:                                      # if no result is found
+        if self.layout == "array":
+            result = self.trie.prefix_search(prefix)
+        elif self.layout == "dict":
+            node = self._find(prefix)
+            result = None if node is None or node[-2] is None else node[-2:]
+        else:
+            result = self.prefix_search_aux(prefix, 0, self.trie)
+        if result is None or result[0] is None:                 # if no result is found
             return [None, None, 0]
         return self.dictionary[result[0]][:2] + [result[1]]
     
     def prefix_search_aux(self, prefix: str, index: int, arr: list) -> tuple[int, int]|None:
         """
-        Function Description: Auxilliary function for prefix_search for recursion.
+        Function Description: Auxilliary function for prefix_search, following the prefix down the trie.
 
         Input:
             prefix: prefix of word
@@ -122,17 +331,923 @@ class Trie:
             Returns [dictionary entry index, num_matches]
             Returns None if there is no result.
 
-        Time Complexity: O(1)
+        Time Complexity: O(M), where M is the length of the prefix
         Space Complexity: O(1)
         """
+        for i in range(index, len(prefix)):
+            if arr is None:
+                return None
+            arr = arr[ord(prefix[i]) - 97]
         if arr is None:
             return None
-        elif len(prefix) == index or len(prefix) == 0:
-            return arr[26:]
-        arr_index = ord(prefix[index]) - 97
-        return self.prefix_search_aux(prefix, index+1, arr[arr_index])
+        return arr[-2:]
+
+    def prefix_top_k(self, prefix: str, k: int) -> list[list[str, str, int]]:
+        """
+        Function Description:
+            Searches for the k words with the highest frequency that have prefix entered, for 
+            autocomplete suggestions.
+
+        Approach Description:
+            Every node already stores its best entry, the highest frequency word below it, so a 
+            best-first search from the node of the prefix only needs to open the nodes leading to
+            the k results. A heap holds two kinds of items, ranked by frequency then word the same
+            way as the best entry of a node:
+            - a node, ranked by its best entry, which no entry below it can beat
+            - an entry, a word that ends at a node already opened
+            Popping an entry gives the next result. Popping a node pushes its children and the 
+            entries whose word ends at that node, chained from the node through following. So the
+            search goes straight down to each result, instead of walking the whole subtree of the 
+            prefix.
+
+        Input:
+            prefix: prefix requested
+            k: number of words requested
+
+        Output:
+            list of up to k [word, definition, frequency], highest frequency first
+
+        Time Complexity: O(M + k*L*log(k*L)), where M is the length of the prefix and L is the 
+                         length of the longest word, plus the duplicate entries of the words opened
+        Aux Space Complexity: O(k*L)
+        """
+        node = self._find(prefix)
+        if node is None or self._best(node) is None:
+            return []
+        return self._top_k([node], k)
+
+    def fuzzy_search(self, prefix: str, k: int, max_edits: int = 1) -> list[list[str, str, int]]:
+        """
+        Function Description:
+            Searches for the k words with the highest frequency that have a prefix within 
+            max_edits insertions, deletions or substitutions of the prefix entered, so typos still
+            give suggestions.
+
+        Approach Description:
+            The trie is walked from the root, keeping for every node a row of the Levenshtein 
+            table: row[j] is the edit distance between the text of the node and prefix[:j]. The 
+            row of a child only depends on the row of its parent and the letter of the child. A 
+            node whose row[-1] is at most max_edits matches, and so do all words below it, so its
+            subtree is not walked further. A node whose row has no value within max_edits cannot 
+            lead to a match, as the values of a row never go below the minimum of the row above, 
+            so its subtree is skipped. The matching subtrees are then searched together by the 
+            best-first search of prefix_top_k.
+
+        Input:
+            prefix: prefix requested
+            k: number of words requested
+            max_edits: largest edit distance allowed, 1 or 2 keeps it interactive
+
+        Output:
+            list of up to k [word, definition, frequency], highest frequency first
+
+        Time Complexity: O(V*M + k*L*log(k*L)), where V is the number of nodes within max_edits
+                         of a prefix of prefix, M the length of prefix and L the length of the 
+                         longest word
+        Aux Space Complexity: O(V*M)
+        """
+        starts = []
+        stack = [(self._find(""), list(range(len(prefix) + 1)))]
+        while stack:
+            node, row = stack.pop()
+            if self._best(node) is None:                        # empty trie
+                continue
+            if row[-1] <= max_edits:                            # all words below match
+                starts.append(node)
+                continue
+            for char, child in self._children(node):
+                next_row = [row[0] + 1]
+                for j in range(1, len(row)):
+                    next_row.append(min(next_row[j-1] + 1, row[j] + 1, row[j-1] + (prefix[j-1] != char)))
+                if min(next_row) <= max_edits:
+                    stack.append((child, next_row))
+        return self._top_k(starts, k)
+
+    def _top_k(self, starts: list[list|int], k: int) -> list[list[str, str, int]]:
+        """
+        Function Description:
+            Best-first search of prefix_top_k over the subtrees of starts, refer to prefix_top_k.
+
+        Input:
+            starts: nodes from _find of subtrees with no node in common
+            k: number of words requested
+
+        Output:
+            list of up to k [word, definition, frequency], highest frequency first
+
+        Time Complexity: O(S + k*L*log(S + k*L)), where S is the number of starts and L is the 
+                         length of the longest word
+        Aux Space Complexity: O(S + k*L)
+        """
+        if k <= 0:
+            return []
+        results, order = [], 0                                  # order breaks ties in the heap
+        heap = []
+        for node in starts:
+            order += 1
+            heap.append((self._rank(self._best(node)), order, node))
+        heapify(heap)
+        while heap and len(results) < k:
+            rank, _, node = heappop(heap)
+            if node is None:                                    # an entry, the last of its rank
+                results.append(self.dictionary[rank[2]])
+                continue
+            for entry in self._ends(node):
+                order += 1
+                heappush(heap, (self._rank(entry), order, None))
+            for _, child in self._children(node):
+                order += 1
+                heappush(heap, (self._rank(self._best(child)), order, child))
+        return results
+
+    def insert(self, word: str, definition: str, frequency: int) -> None:
+        """
+        Function Description:
+            Adds a word to the dictionary and the trie, without rebuilding it.
+
+        Input:
+            word: string of the word
+            definition: definition of the word
+            frequency: frequency of the word
+
+        Time Complexity: O(L), where L is the length of the word
+        Aux Space Complexity: O(L), where L is the length of the word
+        """
+        self._before_update()
+        self.dictionary.append([word, definition, frequency])
+        entry = len(self.dictionary) - 1
+        if self.layout == "array":
+            self.trie.record_word(word, entry)
+        else:
+            self.record_word(word, 0, entry, self.trie)
+
+    def delete(self, word: str) -> int:
+        """
+        Function Description:
+            Removes every entry of a word from the dictionary and the trie, without rebuilding it.
+
+        Approach Description:
+            Only the nodes on the path of the word hold it. Going up the path from its last node,
+            num_matches is decreased, a node left without matches is unlinked from its parent, and
+            a node whose best entry was the word has its best entry chosen again among the best 
+            entries of its children, already correct below it, and the entries ending at the node.
+            The entry is taken out of the chain of entries ending at the last node first.
+            The entry is then replaced by None in the dictionary, so the entry indices of the 
+            other words, and the order of words of the same frequency, stay the same.
+            Unlinked nodes of layout "array" stay in the arrays unused.
+
+        Input:
+            word: string of the word
+
+        Output:
+            number of entries removed, 0 if the word is not in the dictionary
+
+        Time Complexity: O(E*L*(E+A)), where E is the number of entries of the word, L its length
+                         and A the largest number of children of a node
+        Aux Space Complexity: O(E+L), where E is the number of entries of the word and L its length
+        """
+        self._before_update()
+        if self._find(word) is None:
+            return 0
+        path = self._path(word)
+        entries = self._ends(path[-1])
+        for entry in entries:
+            self._set_end(path[-1], self.following[entry])          # entry is first in the chain
+            self.following[entry] = -1
+            for depth in range(len(word), -1, -1):
+                node = path[depth]
+                self._add_count(node, -1)
+                if depth > 0 and self._count(node) == 0:            # no words left below node
+                    self._unlink(path[depth-1], word[depth-1])
+                elif self._best(node) == entry:
+                    self._choose_best(node)
+            self.dictionary[entry] = None                           # keeps the other indices
+            self.deleted += 1
+        return len(entries)
+
+    def update_frequency(self, word: str, frequency: int) -> int:
+        """
+        Function Description:
+            Changes the frequency of every entry of a word, without rebuilding the trie.
+
+        Approach Description:
+            Only the best entries of the nodes on the path of the word can change. Going up the 
+            path from its last node, a node takes the word as best entry if it now ranks before 
+            the best one, and a node whose best entry was the word, whose frequency may have 
+            dropped, has it chosen again as in delete.
+
+        Input:
+            word: string of the word
+            frequency: new frequency
+
+        Output:
+            number of entries changed, 0 if the word is not in the dictionary
+
+        Time Complexity: O(E*L*(E+A)), where E is the number of entries of the word, L its length
+                         and A the largest number of children of a node
+        Aux Space Complexity: O(E+L), where E is the number of entries of the word and L its length
+        """
+        self._before_update()
+        if self._find(word) is None:
+            return 0
+        path = self._path(word)
+        entries = self._ends(path[-1])
+        for entry in entries:
+            self.dictionary[entry] = self.dictionary[entry][:2] + [frequency]   # Dictionary shares the old list
+            for node in reversed(path):
+                if self._best(node) == entry:
+                    self._choose_best(node)
+                elif self._rank(entry) < self._rank(self._best(node)):
+                    self._set_best(node, entry)
+        return len(entries)
+
+    def _before_update(self) -> None:
+        """Raises ValueError if the trie cannot be changed, as one opened by Trie.load"""
+        if isinstance(self.dictionary, SnapshotDictionary):
+            raise ValueError("a trie opened by Trie.load is read-only")
+
+    def _ends(self, node: list|int) -> list[int]:
+        """Returns the entries whose word ends at a node from _find, through following"""
+        if self.layout == "array":
+            entry = self.trie.end[node]
+        else:
+            entry = -1 if node[-3] is None else node[-3]
+        entries = []
+        while entry != -1:
+            entries.append(entry)
+            entry = self.following[entry]
+        return entries
+
+    def _set_end(self, node: list|int, entry: int) -> None:
+        """Sets the first entry ending at a node from _find, -1 for none"""
+        if self.layout == "array":
+            self.trie.end[node] = entry
+        else:
+            node[-3] = None if entry == -1 else entry
+
+    def _path(self, word: str) -> list[list|int]:
+        """Returns the nodes from the root to the node of a word in the trie"""
+        path = [self._find("")]
+        for char in word:
+            path.append(self._child(path[-1], char))
+        return path
+
+    def _choose_best(self, node: list|int) -> None:
+        """
+        Function Description:
+            Sets the best entry of a node from _find again, from the best entries of its children
+            and the entries ending at it.
+
+        Time Complexity: O(A+E), where A is the number of children and E the number of entries
+                         ending at the node
+        Aux Space Complexity: O(A+E)
+        """
+        candidates = [self._best(child) for _, child in self._children(node)]
+        candidates += self._ends(node)
+        self._set_best(node, min(candidates, key=self._rank, default=None))
+
+    def _set_best(self, node: list|int, entry: int|None) -> None:
+        """Sets the best entry of a node from _find"""
+        if self.layout == "array":
+            self.trie.best[node] = -1 if entry is None else entry
+        else:
+            node[-2] = entry
+
+    def _add_count(self, node: list|int, change: int) -> None:
+        """Adds change to the num_matches of a node from _find"""
+        if self.layout == "array":
+            self.trie.count[node] += change
+        else:
+            node[-1] += change
+
+    def _unlink(self, node: list|int, char: str) -> None:
+        """Removes the child of a node from _find by char"""
+        if self.layout == "dict":
+            del node[0][char]
+            return
+        if self.layout == "list":
+            node[ord(char) - 97] = None
+            return
+        child = self.trie.child(node, ord(char))
+        if self.trie.first[node] == child:
+            self.trie.first[node] = self.trie.sibling[child]
+            return
+        previous = self.trie.first[node]
+        while self.trie.sibling[previous] != child:
+            previous = self.trie.sibling[previous]
+        self.trie.sibling[previous] = self.trie.sibling[child]
+
+    def _rank(self, entry: int) -> tuple[int, str, int]:
+        """Order of entries in the trie, highest frequency then smallest word first"""
+        word, _, frequency = self.dictionary[entry]
+        return -frequency, word, entry
+
+    def _find(self, prefix: str) -> list|int|None:
+        """
+        Function Description:
+            Returns the node of the prefix, a list or a TrieNodes index depending on the layout,
+            None if no word has the prefix. The other helpers below take such a node.
+
+        Time Complexity: O(M), where M is the length of the prefix
+        Space Complexity: O(1)
+        """
+        node = self.trie if self.layout != "array" else 0
+        for char in prefix:
+            if self.layout == "array":
+                node = self.trie.child(node, ord(char))
+                if node == -1:
+                    return None
+            elif self.layout == "dict":
+                node = node[0].get(char)
+                if node is None:
+                    return None
+            else:
+                node = node[ord(char) - 97]
+                if node is None:
+                    return None
+        return node
+
+    def _children(self, node: list|int) -> list[tuple[str, list|int]]:
+        """
+        Function Description:
+            Returns the children of a node from _find as (character, child) pairs.
+
+        Time Complexity: O(1) for layout "list" (26 slots), O(A) for "array" and "dict", where A
+                         is the number of children
+        Space Complexity: O(A), where A is the number of children
+        """
+        if self.layout == "array":
+            children, child = [], self.trie.first[node]
+            while child != -1:
+                children.append((chr(self.trie.label[child]), child))
+                child = self.trie.sibling[child]
+            return children
+        if self.layout == "dict":
+            return list(node[0].items())
+        return [(chr(97 + i), node[i]) for i in range(26) if node[i] is not None]
+
+    def _best(self, node: list|int) -> int|None:
+        """Returns the best entry of a node from _find, None if it has none"""
+        if self.layout == "array":
+            best = self.trie.best[node]
+            return None if best == -1 else best
+        return node[-2]
+
+    def _child(self, node: list|int, char: str) -> list|int|None:
+        """Returns the child of a node from _find by char, None if there is none"""
+        if self.layout == "array":
+            child = self.trie.child(node, ord(char))
+            return None if child == -1 else child
+        if self.layout == "dict":
+            return node[0].get(char)
+        return node[ord(char) - 97]
+
+    def _count(self, node: list|int) -> int:
+        """Returns the num_matches of a node from _find"""
+        if self.layout == "array":
+            return self.trie.count[node]
+        return node[-1]
+
+    def session(self) -> "TrieSession":
+        """Returns a TrieSession at the empty prefix, refer to TrieSession"""
+        return TrieSession(self)
+
+    def bytes_per_word(self) -> float:
+        """
+        Function Description:
+            Returns the memory held by the nodes of the trie divided by the number of words, not
+            counting the dictionary itself, to compare layouts.
+
+        Approach Description:
+            For layout "list", every node list is visited and measured with sys.getsizeof. The 
+            ints and None held in the slots are not counted, as small ints and None are shared. 
+            For layout "dict", the dict of edges of every node is measured as well. The following 
+            array of entries is added for both.
+            For layout "array", the sizes of the arrays are added.
+
+        Output:
+            bytes per word
+
+        Time Complexity: O(N), where N is the number of nodes
+        Aux Space Complexity: O(N), where N is the number of nodes
+        """
+        if self.layout == "array":
+            total = self.trie.nbytes()
+        elif self.layout == "dict":
+            total, stack = 0, [self.trie]
+            while stack:
+                arr = stack.pop()
+                total += sys.getsizeof(arr) + sys.getsizeof(arr[0])
+                stack.extend(arr[0].values())
+        else:
+            total, stack = 0, [self.trie]
+            while stack:
+                arr = stack.pop()
+                total += sys.getsizeof(arr)
+                stack.extend(child for child in arr[:26] if child is not None)
+        if self.layout != "array":
+            total += sys.getsizeof(self.following)
+        return total / max(len(self.dictionary) - self.deleted, 1)
+
+    def save(self, path: str) -> None:
+        """
+        Function Description:
+            Writes the trie and its dictionary to a file as a flat binary image, which Trie.load 
+            can memory map and query without reading it all.
+
+        Approach Description:
+            The image holds, each section starting at a multiple of 8 bytes:
+            header: magic, then number of nodes, entries and bytes of string pool as int64
+            nodes: the label, best, count, first, sibling and end arrays of TrieNodes, as int32
+            following: next entry of the same word of every entry, as int32
+            frequencies: frequency of every entry, as int64
+            offsets: 2*entries+1 int64, word i is pool[offsets[2i]:offsets[2i+1]] and its 
+                     definition is pool[offsets[2i+1]:offsets[2i+2]]
+            pool: every word and definition in UTF-8, one after another
+            Numbers are in the byte order of this machine, recorded in the magic. A trie with 
+            layout "list" or "dict", or with deleted entries, is first recorded into a TrieNodes, 
+            without the deleted entries.
+
+        Input:
+            path: file to write
+
+        Time Complexity: O(T), where T is the total number of characters in the dictionary
+        Aux Space Complexity: O(T), where T is the total number of characters in the dictionary
+        """
+        nodes, dictionary = self.trie, self.dictionary
+        if self.layout != "array" or self.deleted:
+            dictionary = [entry for entry in self.dictionary if entry is not None]
+            nodes = TrieNodes(dictionary)
+            for i, entry in enumerate(dictionary):
+                nodes.record_word(entry[0], i)
+        frequencies, offsets, pool = array('q'), array('q', [0]), bytearray()
+        for word, definition, frequency in dictionary:
+            frequencies.append(frequency)
+            for text in (word, definition):
+                pool += text.encode('utf-8')
+                offsets.append(len(pool))
+        with open(path, "wb") as file:
+            file.write(SNAPSHOT_MAGIC + sys.byteorder[0].encode())
+            file.write(array('q', [len(nodes.label), len(dictionary), len(pool)]).tobytes())
+            for arr in (nodes.label, nodes.best, nodes.count, nodes.first, nodes.sibling, nodes.end, 
+                        nodes.following):
+                file.write(arr.tobytes() + bytes(-len(arr)*4 % 8))
+            file.write(frequencies.tobytes())
+            file.write(offsets.tobytes())
+            file.write(pool)
+
+    @classmethod
+    def load(cls, path: str) -> "Trie":
+        """
+        Function Description:
+            Opens a file written by Trie.save, without deserialising it.
+
+        Approach Description:
+            The file is memory mapped, and every section is used in place through a memoryview 
+            cast to int32 or int64, so the operating system only reads the pages that queries 
+            touch. The nodes become a read-only TrieNodes and the dictionary a SnapshotDictionary,
+            which decodes an entry from the pool when it is accessed.
+
+        Input:
+            path: file written by Trie.save
+
+        Output:
+            Trie with layout "array", which can be searched but not changed
+
+        Time Complexity: O(1)
+        Aux Space Complexity: O(1)
+        """
+        with open(path, "rb") as file:
+            image = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(image)
+        if view[:8] != SNAPSHOT_MAGIC + sys.byteorder[0].encode():
+            raise ValueError("not a trie snapshot of this byte order: " + path)
+        n_nodes, n_entries, n_pool = view[8:32].cast('q')
+        position = 32
+        sections = []
+        for size, fmt in [(n_nodes, 'i')]*6 + [(n_entries, 'i'), (n_entries, 'q'), (2*n_entries+1, 'q')]:
+            length = size * (4 if fmt == 'i' else 8)
+            sections.append(view[position:position+length].cast(fmt))
+            position += length + (-length % 8)
+        trie = cls.__new__(cls)
+        trie.dictionary = SnapshotDictionary(sections[7], sections[8], view[position:position+n_pool])
+        trie.layout = "array"
+        trie.deleted = 0
+        trie.trie = TrieNodes(trie.dictionary, sections[:7])
+        trie.following = trie.trie.following
+        trie.image = image                                      # keeps the mapping open
+        return trie
+
+
+def _shard_trie(words: list[str], frequencies: list[int], entries: list[int]) -> tuple:
+    """
+    Function Description:
+        Task of Trie.sharded, records words that all start with the same letter into a TrieNodes 
+        of their own, whatever the layout of the Trie, so that only flat arrays are pickled back.
+
+    Output:
+        the label, best, count, first, sibling and end arrays of the nodes below the root, with 
+        node IDs starting at 0 for the node of the first letter, then following, the next entry 
+        of the same word of every word, all with the entry indices of Dictionary
+
+    Time Complexity: O(T), where T is the total number of characters of the words
+    Aux Space Complexity: O(T), where T is the total number of characters of the words
+    """
+    nodes = Trie([[word, None, frequency] for word, frequency in zip(words, frequencies)], "array").trie
+    best = array('i', [entries[entry] for entry in nodes.best[1:]])         # every node has words
+    first = array('i', [-1 if node == -1 else node - 1 for node in nodes.first[1:]])
+    sibling = array('i', [-1 if node == -1 else node - 1 for node in nodes.sibling[1:]])
+    end = array('i', [-1 if entry == -1 else entries[entry] for entry in nodes.end[1:]])
+    following = array('i', [-1 if entry == -1 else entries[entry] for entry in nodes.following])
+    return nodes.label[1:], best, nodes.count[1:], first, sibling, end, following
+
+
+class TrieSession:
+
+    def __init__(self, trie: Trie) -> None:
+        """
+        Function Description:
+            Cursor for interactive autocomplete, following the prefix typed one character at a time
+            instead of searching it again from the root on every keystroke.
+
+        Approach Description:
+            A stack holds the node of every prefix typed so far, from the root, with None once the 
+            prefix has no words. Typing a character pushes the child of the last node, and backspace 
+            pops, so both only look at one node. The result of the last node is the same 
+            [word, definition, num_matches] as Trie.prefix_search of the prefix. The characters 
+            typed are kept in a list, so the prefix is only joined into a string when asked for.
+
+        Input:
+            trie: the Trie to search
+
+        Time Complexity: O(1)
+        Aux Space Complexity: O(1)
+        """
+        self.trie = trie
+        self.stack = [trie._find("")]                   # node of every prefix typed
+        self.chars = []                                 # characters typed
+
+    def type(self, char: str) -> list[str|None, str|None, int]:
+        """
+        Function Description:
+            Adds a character at the end of the prefix.
+
+        Input:
+            char: character typed
+        Output:
+            list in the form [word, definition, num_matches], as in Trie.prefix_search
+
+        Time Complexity: O(1) for layouts "list" and "dict", O(A) for "array" where A is the number of 
+                         children of the node, plus the length of the word and definition returned
+        Aux Space Complexity: O(1)
+        """
+        node = self.stack[-1]
+        self.stack.append(None if node is None else self.trie._child(node, char))
+        self.chars.append(char)
+        return self.result()
+
+    def backspace(self) -> list[str|None, str|None, int]:
+        """
+        Function Description:
+            Removes the last character of the prefix, if any.
+
+        Output:
+            list in the form [word, definition, num_matches], as in Trie.prefix_search
+
+        Time Complexity: O(1), plus the length of the word and definition returned
+        Aux Space Complexity: O(1)
+        """
+        if len(self.stack) > 1:
+            self.stack.pop()
+            self.chars.pop()
+        return self.result()
+
+    def prefix(self) -> str:
+        """
+        Function Description:
+            Returns the prefix typed so far
+
+        Time Complexity: O(M), where M is the length of the prefix
+        Aux Space Complexity: O(M), where M is the length of the prefix
+        """
+        return "".join(self.chars)
+
+    def result(self) -> list[str|None, str|None, int]:
+        """
+        Function Description:
+            Returns the word with the highest frequency that has the current prefix.
+
+        Output:
+            list in the form [word, definition, num_matches], as in Trie.prefix_search
+
+        Time Complexity: O(N), where N is the length of the word and definition returned
+        Aux Space Complexity: O(N), where N is the length of the word and definition returned
+        """
+        node = self.stack[-1]
+        if node is None or self.trie._best(node) is None:
+            return [None, None, 0]
+        return self.trie.dictionary[self.trie._best(node)][:2] + [self.trie._count(node)]
+
+
+class TrieNodes:
+
+    def __init__(self, dictionary: list[list[str, str, int]], arrays: list|None = None) -> None:
+        """
+        Function Description:
+            Compact storage of the nodes of a Trie in flat arrays, as an alternative to a list of 
+            29 slots per node.
+
+        Approach Description:
+            Every node is an index into six array('i'): label is the code of the letter leading
+            to the node, best the dictionary entry index of the highest frequency word (-1 if 
+            none), count the num_matches, first the first child and sibling the next child of the
+            same parent (-1 if none), and end the first entry whose word ends at the node (-1 if 
+            none). The children of a node are a linked list through sibling, so a node only costs
+            24 bytes no matter how many of its 26 letters are used, and any character code can be
+            stored. Node 0 is the root. One more array('i'), following, gives for every entry the
+            next entry of the same word, -1 if none, as in Trie.
+
+        Input:
+            dictionary: the dictionary of the Trie, to compare entries
+            arrays: existing label, best, count, first, sibling, end and following arrays, such as
+                    the memoryviews of Trie.load, None for an empty trie
+
+        Time Complexity: O(1)
+        Aux Space Complexity: O(1)
+        """
+        self.dictionary = dictionary
+        if arrays is None:
+            arrays = (array('i', [0]), array('i', [-1]), array('i', [0]), array('i', [-1]), array('i', [-1]), 
+                      array('i', [-1]), array('i'))
+        self.label, self.best, self.count, self.first, self.sibling, self.end, self.following = arrays
+
+    def child(self, node: int, code: int) -> int:
+        """
+        Function Description:
+            Returns the child of node reached by the character of code code, -1 if there is none
+
+        Time Complexity: O(A), where A is the number of children of node, at most 26 for a-z
+        Aux Space Complexity: O(1)
+        """
+        child = self.first[node]
+        while child != -1 and self.label[child] != code:
+            child = self.sibling[child]
+        return child
+
+    def record_word(self, word: str, entry: int) -> None:
+        """
+        Function Description: 
+            Register the letters of input word into the trie, as in Trie.record_word.
+
+        Input:
+            word: string to be inputted into the trie
+            entry: current word dictionary entry index
+
+        Time Complexity: O(L) where L is the number of characters in the strings
+        Aux Space Complexity: O(L) where L is the number of characters in the strings
+        """
+        frequency = self.dictionary[entry][2]
+        node = 0
+        for index in range(len(word) + 1):
+            self.count[node] += 1                                           # increase num_matches
+            best = self.best[node]
+            if best == -1:                                                  # if there are no entries yet
+                self.best[node] = entry
+            elif best != entry:
+                if frequency > self.dictionary[best][2]:                    # compares frequency
+                    self.best[node] = entry
+                elif frequency == self.dictionary[best][2] and word < self.dictionary[best][0]:
+                    self.best[node] = entry                                 # compares string
+            if index == len(word):                                          # if there are no letters left
+                while len(self.following) <= entry:
+                    self.following.append(-1)
+                self.following[entry] = self.end[node]
+                self.end[node] = entry                                      # word ends here
+                return
+            code = ord(word[index])
+            child = self.child(node, code)
+            if child == -1:                                                 # creates node if no entries yet
+                child = len(self.label)
+                self.label.append(code)
+                self.best.append(-1)
+                self.count.append(0)
+                self.first.append(-1)
+                self.sibling.append(self.first[node])
+                self.end.append(-1)
+                self.first[node] = child
+            node = child
+
+    def prefix_search(self, prefix: str) -> tuple[int, int]|None:
+        """
+        Function Description:
+            Follows the prefix down the trie, as in Trie.prefix_search_aux.
+
+        Output:
+            Returns [dictionary entry index, num_matches]
+            Returns None if there is no result.
+
+        Time Complexity: O(M), where M is the length of the prefix
+        Aux Space Complexity: O(1)
+        """
+        node = 0
+        for char in prefix:
+            node = self.child(node, ord(char))
+            if node == -1:
+                return None
+        if self.best[node] == -1:
+            return None
+        return [self.best[node], self.count[node]]
+
+    def nbytes(self) -> int:
+        """
+        Function Description:
+            Returns the number of bytes held by the arrays, counting their spare capacity
+
+        Time Complexity: O(1)
+        Aux Space Complexity: O(1)
+        """
+        return sum(sys.getsizeof(arr) for arr in (self.label, self.best, self.count, self.first, self.sibling, 
+                                                  self.end, self.following))
     
 
+class SnapshotDictionary:
+
+    def __init__(self, frequencies: memoryview, offsets: memoryview, pool: memoryview) -> None:
+        """
+        Function Description:
+            Read-only dictionary of a Trie opened by Trie.load, used the same way as the list of
+            [word, definition, frequency] it replaces.
+
+        Input:
+            frequencies, offsets, pool: sections of the image, as stated in Trie.save
+
+        Time Complexity: O(1)
+        Aux Space Complexity: O(1)
+        """
+        self.frequencies = frequencies
+        self.offsets = offsets
+        self.pool = pool
+
+    def __len__(self) -> int:
+        """
+        Function Description:
+            Number of entries
+
+        Time Complexity: O(1)
+        Aux Space Complexity: O(1)
+        """
+        return len(self.frequencies)
+
+    def __getitem__(self, i: int) -> list[str, str, int]:
+        """
+        Function Description:
+            Returns entry i as [word, definition, frequency], decoding the strings from the pool
+
+        Time Complexity: O(N), where N is the number of characters of the word and definition
+        Aux Space Complexity: O(N), where N is the number of characters of the word and definition
+        """
+        if not -len(self) <= i < len(self):
+            raise IndexError(i)
+        i %= len(self)
+        start, middle, end = self.offsets[2*i], self.offsets[2*i+1], self.offsets[2*i+2]
+        return [str(self.pool[start:middle], 'utf-8'), str(self.pool[middle:end], 'utf-8'), 
+                self.frequencies[i]]
+
+
+class RadixTrie:
+
+    def __init__(self, Dictionary: list[list[str, str, int]]) -> None:
+        """
+        Function Description:
+            Path compressed variant of Trie, with the same prefix_search, where a chain of nodes 
+            with one child each is a single edge labelled by several characters.
+
+        Approach Description:
+            Every word is written once into self.pool, a string of all words one after another, 
+            and an edge label is a (start, end) pair of offsets into it, so labels cost no string
+            of their own. A node is [children, start, end, best, count], where children is a dict
+            of the first character of the label of a child to the child, (start, end) the label 
+            of the edge into the node, and best and num_matches as in Trie. A node only exists 
+            where words branch or end, so there are at most two nodes per word.
+
+        Input:
+            Dictionary: A list of list containing the string of the word, definition and 
+            frequency of word used in int.
+
+        Time Complexity: O(T), where T is the total number of characters in Dictionary.txt
+        Aux Space Complexity: O(T), where T is the total number of characters in Dictionary.txt
+        """
+        self.dictionary = Dictionary
+        self.pool = "".join(entry[0] for entry in Dictionary)
+        self.trie = [{}, 0, 0, None, 0]                 # children, label start, label end, best, num_matches
+        start = 0
+        for i, entry in enumerate(Dictionary):
+            self.record_word(entry[0], i, start)
+            start += len(entry[0])
+
+    def record_word(self, word: str, entry: int, start: int) -> None:
+        """
+        Function Description:
+            Register input word into the trie.
+
+        Approach Description:
+            Going down from the root, the best entry and num_matches of every node on the way are
+            updated as in Trie.record_word. The child starting with the next character of the 
+            word is compared with the word along its label. If the word leaves the label part
+            way, the edge is split there by a new node taking the matched part of the label. If 
+            no child starts with the next character, the rest of the word becomes a new leaf.
+
+        Input:
+            word: string to be inputted into the trie
+            entry: current word dictionary entry index
+            start: offset of word in self.pool
+
+        Time Complexity: O(L) where L is the number of characters in the strings
+        Aux Space Complexity: O(1)
+        """
+        frequency = self.dictionary[entry][2]
+        node, index = self.trie, 0
+        while True:
+            node[-1] += 1                                               # increase num_matches
+            best = node[-2]
+            if best is None:                                            # if there are no entries yet
+                node[-2] = entry
+            elif best != entry:
+                if frequency > self.dictionary[best][2]:                # compares frequency
+                    node[-2] = entry
+                elif frequency == self.dictionary[best][2] and word < self.dictionary[best][0]:
+                    node[-2] = entry                                    # compares string
+            if index == len(word):                                      # if there are no letters left
+                return
+            child = node[0].get(word[index])
+            if child is None:                                           # rest of the word as a leaf
+                node[0][word[index]] = [{}, start + index, start + len(word), None, 0]
+                node = node[0][word[index]]
+                index = len(word)
+                continue
+            matched, length = 0, child[2] - child[1]
+            while matched < length and index + matched < len(word) and \
+                    self.pool[child[1] + matched] == word[index + matched]:
+                matched += 1
+            if matched < length:                                        # splits the edge
+                middle = [{self.pool[child[1] + matched]: child}, child[1], child[1] + matched, 
+                          child[-2], child[-1]]
+                child[1] += matched
+                node[0][word[index]] = middle
+                child = middle
+            node, index = child, index + matched
+
+    def prefix_search(self, prefix: str) -> list[str|None, str|None, int]:
+        """
+        Function Description:
+            Searches for the word with the highest frequency that has prefix entered, as in 
+            Trie.prefix_search.
+
+        Approach Description:
+            Follows the prefix down the edges, comparing it with the pool along every label, 
+            until the prefix ends, possibly part way through a label, where every word below the
+            edge has the prefix.
+
+        Input:
+            prefix: prefix requested
+
+        Output:
+            list in the form [word, definition, num_matches]
+
+        Time Complexity: O(M+N), where M is the length of the prefix and N is the total number 
+                         of characters in the word with the highest frequency and its definition
+        Aux Space Complexity: O(M+N)
+        """
+        node, index = self.trie, 0
+        while index < len(prefix):
+            node = node[0].get(prefix[index])
+            if node is None:
+                return [None, None, 0]
+            length = min(node[2] - node[1], len(prefix) - index)
+            if not self.pool.startswith(prefix[index:index + length], node[1]):
+                return [None, None, 0]
+            index += length
+        if node[-2] is None:                                            # if the trie is empty
+            return [None, None, 0]
+        return self.dictionary[node[-2]][:2] + [node[-1]]
+
+    def bytes_per_word(self) -> float:
+        """
+        Function Description:
+            Returns the memory held by the nodes and the pool divided by the number of words, as
+            in Trie.bytes_per_word.
+
+        Time Complexity: O(N), where N is the number of nodes
+        Aux Space Complexity: O(N), where N is the number of nodes
+        """
+        total, stack = sys.getsizeof(self.pool), [self.trie]
+        while stack:
+            node = stack.pop()
+            total += sys.getsizeof(node) + sys.getsizeof(node[0])
+            stack.extend(node[0].values())
+        return total / max(len(self.dictionary), 1)
+
+
 # Question2
 class AGraph():
 
@@ -142,40 +1257,60 @@ class AGraph():
             Initialise the graph needed for bipartite matching. 
 
         Approach Description:
-            Used adjacency matrix for easy reverse flow. 
+            Used a residual graph of edge arrays, so only the edges that exist take memory.
             The order of vertices are as follows: car_1 to car_n/5, person_1 to person_n, source, target
-            Every cell has a list of integers that represents [flow, capacity, licence (1 for True)]. 
-            If no edge is found between them, it is represented by None. Reverse flow is also set here.
+            Edge e goes to self.head[e] and has self.flow[e], self.capacity[e] and self.licence[e] 
+            (1 for a driver, -1 for the reverse of a driver). Edges are added in pairs, so the 
+            reverse flow of edge e is edge e ^ 1. self.adjacency[v] lists the edges leaving v in 
+            order of the vertex they go to, so DFS visits them in the same order as a row of an 
+            adjacency matrix.
             Target capacity is set to 2 first, then we run max_flow() once before changing it to 5.
 
         Input: 
             preferences: list of a person's list of preference of destinations
             licences: list of people who has driving licence
 
-        Time Complexity: O(n^2) where n is len(preference), aka number of people
-        Aux Space Complexity: O(n^2) where n is len(preference), aka number of people
+        Time Complexity: O(n + P) where n is len(preference), aka number of people, and P is the
+                         total number of preferences
+        Aux Space Complexity: O(n + P) where n is len(preference), aka number of people, and P is
+                              the total number of preferences
         """
         self.cars = ceil(len(preferences)/5)                     # number of destinations (ceil(n/5))
         self.people = len(preferences)
         self.vertices = self.cars + self.people + 2              # all vertices in the graph
         self.licences = licences
-        self.graph = []
-        for _ in range(self.vertices):                           # rows of matrix
-            self.graph.append([None]*self.vertices)              # None for no edges/paths
+        self.head, self.flow, self.capacity, self.licence = array('i'), array('i'), array('i'), array('i')
+        self.adjacency = [[] for _ in range(self.vertices)]      # edges leaving every vertex
+        drivers = set(licences)
         for i, person in enumerate(preferences):                 # for every person,
-            for destination in person:                           # for every destination they want to go
-                self.graph[self.cars + i][destination] = [0, 1, 0]        # flow, capacity, licence
-                self.graph[destination][self.cars + i] = [0, 0, 0]        # reverse flow
-            self.graph[-2][self.cars + i] = [0, 1, 0]                     # source
-            self.graph[self.cars + i][-2] = [0, 0, 0]                     # source reverse
+            for destination in sorted(set(person)):              # for every destination they want to go
+                self.add_edge(self.cars + i, destination, 1, 1 if i in drivers else 0)
+        for i in range(self.people):
+            self.add_edge(self.vertices - 2, self.cars + i, 1, 0)         # source
+        self.target_edges = []
         for i in range(self.cars):
-            self.graph[i][-1] = [0, 2, 0]                # target (set as 2[min driver required] for now)
-            self.graph[-1][i] = [0, 0, 0]                                 # target reverse
-        for person in self.licences:                                      # setting those with licence
-            for i, edge in enumerate(self.graph[person + self.cars]):
-                if edge is not None and edge[1] != 0:    # latter is so source node doesn't get affected
-                    edge[2] = 1      
-                    self.graph[i][person + self.cars][2] = -1             # reduction of drivers
+            self.target_edges.append(len(self.head))     # target (set as 2[min driver required] for now)
+            self.add_edge(i, self.vertices - 1, 2, 0)
+
+    def add_edge(self, fro: int, to: int, capacity: int, licence: int) -> None:
+        """
+        Function Description:
+            Adds an edge and its reverse flow to the residual graph.
+
+        Input: 
+            fro, to: vertices of the edge
+            capacity: capacity of the edge
+            licence: 1 if the edge is from a driver, 0 if not
+
+        Time Complexity: O(1)
+        Aux Space Complexity: O(1)
+        """
+        for u, v, c, l in ((fro, to, capacity, licence), (to, fro, 0, -licence)):   # edge, reverse flow
+            self.adjacency[u].append(len(self.head))
+            self.head.append(v)
+            self.flow.append(0)
+            self.capacity.append(c)
+            self.licence.append(l)
 
     def max_flow(self, flow: int, visited: list[bool]) -> int:
         """
@@ -188,10 +1323,10 @@ class AGraph():
             flow = 0, while visited is True only for non-drivers (so DFS does not run them).
             The second time, as we already ran max_flow once, flow = previous flow result, 
             and visited is False for all. 
-            Time Complexity for normal max_flow is O(EF), but if everyone wants to go to every
-            possible destination, the graph gets dense, and E = n^2. The max_flow = number of people,
-            which is n, therefore, resultant time complexity is O(n^3).
-            Aux space complexity is O(n^2), as stack memory is cleared once recursion ends.
+            Time Complexity for normal max_flow is O(EF), where E = n + P with the edge arrays.
+            The max_flow = number of people, which is n, therefore, resultant time complexity 
+            is O(n(n + P)).
+            Aux space complexity is O(n + P), as stack memory is cleared once recursion ends.
 
         Input: 
             flow: the flow of the graph
@@ -200,8 +1335,8 @@ class AGraph():
         Output:
             Returns the maximum flow of the graph
 
-        Time Complexity: O(n^3), where n is number of people
-        Aux Space Complexity: O(n^2), where n is number of people
+        Time Complexity: O(n(n + P)), where n is number of people and P is number of preferences
+        Aux Space Complexity: O(n + P), where n is number of people and P is number of preferences
         """
         augment = 1                             # to kickstart loop
         while augment > 0:
@@ -217,7 +1352,7 @@ class AGraph():
 
         Approach Description:
             A typical DFS for Ford-Fulkerson method that checks if there is a one-to-one 
-            exchange of drivers. 
+            exchange of drivers. Only the edges leaving a vertex are scanned.
 
         Input: 
             fro, to: current vertex, target vertex
@@ -229,51 +1364,130 @@ class AGraph():
             Returns the resultant flow of the path
 
         Time Complexity: O(E) where E is the number of edges
-        Aux Space Complexity: O(E) where E is the number of edges
+        Aux Space Complexity: O(V) where V is the number of vertices
         """
         if fro == to:
             return bottleneck
         visited[fro] = True                                         # vertex is visited
-        for i, edge in enumerate(self.graph[fro]):
-            if edge is not None:
-                residual = edge[1] - edge[0]
-                driver = edge[2] + previous                         # one to one exchange of drivers
-                if residual > 0 and not visited[i] and driver >= 0:
-                    augment = self.dfs(i, to, min(bottleneck, residual), visited, edge[2])
-                    if augment > 0:
-                        edge[0] += augment                              
-                        self.graph[i][fro][0] -= augment            # reverse flow
-                        return augment
+        for edge in self.adjacency[fro]:
+            i = self.head[edge]
+            residual = self.capacity[edge] - self.flow[edge]
+            driver = self.licence[edge] + previous                  # one to one exchange of drivers
+            if residual > 0 and not visited[i] and driver >= 0:
+                augment = self.dfs(i, to, min(bottleneck, residual), visited, self.licence[edge])
+                if augment > 0:
+                    self.flow[edge] += augment
+                    self.flow[edge ^ 1] -= augment                  # reverse flow
+                    return augment
         return 0                                                    # no augmenting path
     
+    def dinic(self, flow: int, visited: list[bool]) -> int:
+        """
+        Function Description:
+            Gets the max flow of the graph with Dinic's algorithm, as a faster replacement of 
+            max_flow taking the same input.
+
+        Approach Description:
+            Whether an edge can be taken depends on the licence of the edge before it, as in dfs,
+            so the search runs on states (vertex, licence of the edge into it), state 
+            3*vertex + licence + 1. Vertices True in visited are never entered, as in max_flow.
+            Every phase, a BFS from the source gives the level of every state, the fewest edges 
+            to reach it. Then paths to the target going one level up per edge are augmented 
+            until none is left, a blocking flow. The DFS for them uses a stack instead of 
+            recursion, and a pointer per state to the next edge to try, so an edge that leads 
+            nowhere is never tried again in the phase. The levels to the target grow every 
+            phase. On the unit capacities of this graph, this is Hopcroft-Karp, with O(sqrt(n)) 
+            phases of O(n + P) each.
+            The exchange of drivers makes the flow found depend on the paths taken, so on the 
+            same input dinic and max_flow can settle on different flows in the driver phase, and
+            one of them may then allocate everyone while the other cannot.
+
+        Input: 
+            flow: the flow of the graph
+            visited: list of bool, True for vertices that cannot be used
+
+        Output:
+            Returns the maximum flow of the graph
+
+        Time Complexity: O(sqrt(n)(n + P)), where n is number of people and P is number of preferences
+        Aux Space Complexity: O(n + P), where n is number of people and P is number of preferences
+        """
+        source, target = self.vertices - 2, self.vertices - 1
+        start = 3*source + 1                                        # source, no driver
+        while True:
+            level = [-1]*(3*self.vertices)                          # BFS levels of the states
+            level[start] = 0
+            queue, reached = [start], False
+            for state in queue:
+                previous = state % 3 - 1
+                for edge in self.adjacency[state // 3]:
+                    i = self.head[edge]
+                    following = 3*i + self.licence[edge] + 1
+                    if self.capacity[edge] > self.flow[edge] and not visited[i] and \
+                            self.licence[edge] + previous >= 0 and level[following] == -1:
+                        level[following] = level[state] + 1
+                        reached = reached or i == target
+                        if i != target:
+                            queue.append(following)
+            if not reached:                                         # no augmenting path
+                return flow
+            pointer = [0]*(3*self.vertices)                         # next edge to try per state
+            stack, path = [start], []                               # states and edges of the path
+            while stack:
+                state = stack[-1]
+                if state // 3 == target:                            # augments the path
+                    bottleneck = min(self.capacity[edge] - self.flow[edge] for edge in path)
+                    for edge in path:
+                        self.flow[edge] += bottleneck
+                        self.flow[edge ^ 1] -= bottleneck           # reverse flow
+                    flow += bottleneck
+                    stack, path = [start], []
+                    continue
+                edges, previous = self.adjacency[state // 3], state % 3 - 1
+                while pointer[state] < len(edges):
+                    edge = edges[pointer[state]]
+                    following = 3*self.head[edge] + self.licence[edge] + 1
+                    if self.capacity[edge] > self.flow[edge] and self.licence[edge] + previous >= 0 \
+                            and level[following] == level[state] + 1:
+                        stack.append(following)
+                        path.append(edge)
+                        break
+                    pointer[state] += 1
+                else:                                               # dead end, leaves the level graph
+                    level[state] = -1
+                    stack.pop()
+                    if path:
+                        path.pop()
+                        pointer[stack[-1]] += 1
+
     def car_arrangement(self) -> list[list[int]]:
         """
         Function Description:
-            Retrieves information from self.graph on allocation of the cars and people.
+            Retrieves information from the residual graph on allocation of the cars and people.
 
         Approach Description:
             By refering to edges in vertices of the cars, if there is a reverse flow from vertices
             that represent people, we would know that those are the people which is allocated
             to this car. 
-            Time complexity is number of cars (n/5) * number of people (n), hence O(n^2).
+            Every edge of the cars is checked once, hence O(n + P).
             Aux space complexity is O(n), as only 0 to n is in the list.
 
         Output: 
             Result of allocation in list of list of people, where index x represents car number x.
 
-        Time Complexity: O(n^2) where n is number of people
+        Time Complexity: O(n + P) where n is number of people and P is number of preferences
         Aux Space Complexity: O(n) where n is the number of people
         """
         arrangement = []
         for car in range(self.cars):
             car_list = []
-            for i, edge in enumerate(self.graph[car]):
-                if edge is not None and edge[0] == -1:      # by retrieving flow == -1, we know which 
-                    car_list.append(i - self.cars)          # person it came from
+            for edge in self.adjacency[car]:
+                if self.flow[edge] == -1:                   # by retrieving flow == -1, we know which 
+                    car_list.append(self.head[edge] - self.cars)    # person it came from
             arrangement.append(car_list)
         return arrangement
 
-    def allocate(self) -> list[list[int]]:
+    def allocate(self, engine: str = "ford_fulkerson") -> list[list[int]]:
         """
         Function Description:
             Allocate people to cars using functions in class AGraph
@@ -282,33 +1496,49 @@ class AGraph():
             By allocating drivers first, it will ensure that there is enough drivers per car,
             and by algorithm in dfs, the ability to prevent a reverse flow of drivers if the 
             incoming flow is not one. This ensures there is always 2 drivers per car.
-            Same complexity as max_flow.
+            Same complexity as max_flow, or dinic with engine "dinic".
+            The two engines can return different results on the same input, even an allocation
+            for one and None for the other, as the driver phase can settle on a different 
+            maximum flow, refer to dinic.
+
+        Input:
+            engine: "ford_fulkerson" for max_flow, "dinic" for dinic
 
         Output: 
             Result of allocation in list of list of people, where index x represents car number x.
 
-        Time Complexity: O(n^3), where n is number of people
-        Aux Space Complexity: O(n^2), where n is number of people
+        Time Complexity: O(n(n + P)), where n is number of people and P is number of preferences
+        Aux Space Complexity: O(n + P), where n is number of people and P is number of preferences
         """
+        if engine == "ford_fulkerson":
+            max_flow = self.max_flow
+        elif engine == "dinic":
+            max_flow = self.dinic
+        else:
+            raise ValueError("unknown engine: " + str(engine))
         visited = [True]*(self.vertices-2)
         visited += [False, False]                                 # for source and target
         for person in self.licences:                              # we only allow travel for drivers
             visited[person + self.cars] = False             
         for i in range(self.cars):                                # and cars
             visited[i] = False
-        if self.cars*2 != self.max_flow(0, visited):              # if not enough (2) drivers for any car
+        if self.cars*2 != max_flow(0, visited):              # if not enough (2) drivers for any car
             return None
         for i in range(self.cars):
-            self.graph[i][-1][1] = 5                              # reset car to target flow back to 5
+            self.capacity[self.target_edges[i]] = 5               # reset car to target flow back to 5
         visited = [False]*self.vertices
-        if self.people != self.max_flow(self.cars*2, visited):    # if allocations not possible
+        if self.people != max_flow(self.cars*2, visited):    # if allocations not possible
             return None
         return self.car_arrangement()                             # get result from graph
     
-def allocate(preferences: list[list[int]], licences: list[int]) -> list[list[int]]:
-    """Refer to class AGraph"""
+def allocate(preferences: list[list[int]], licences: list[int], 
+             engine: str = "ford_fulkerson") -> list[list[int]]:
+    """
+    Refer to class AGraph, engine is "ford_fulkerson" or "dinic" as in AGraph.allocate, which
+    can give different results, even an allocation for one and None for the other
+    """
     graph = AGraph(preferences, licences)
-    return graph.allocate()
+    return graph.allocate(engine)
 
 if __name__ == "__main__":
     Dictionary = load_dictionary("Dictionary.txt")
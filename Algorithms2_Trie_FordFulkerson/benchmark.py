@@ -0,0 +1,375 @@
+import os
+import tempfile
+from random import Random
+from time import perf_counter
+from assignment2 import allocate, iter_dictionary, load_dictionary, RadixTrie, Trie
+
+class RecursiveTrie(Trie):
+    """Trie with the recursive record_word and prefix_search_aux it had before, for comparison"""
+
+    def record_word(self, word: str, index: int, entry: int, arr: list) -> None:
+        arr[-1] += 1
+        if arr[-2] is None:
+            arr[-2] = entry
+        elif arr[-2] != entry:
+            if self.dictionary[entry][2] > self.dictionary[arr[-2]][2]:
+                arr[-2] = entry
+            elif self.dictionary[entry][2] == self.dictionary[arr[-2]][2]:
+                if self.dictionary[entry][0][index:] < self.dictionary[arr[-2]][0][index:]:
+                    arr[-2] = entry
+        if len(word) == index:
+            return
+        arr_index = ord(word[index]) - 97
+        if arr[arr_index] is None:
+            arr[arr_index] = [None for _ in range(28)] + [0]
+        self.record_word(word, index+1, entry, arr[arr_index])
+
+    def prefix_search_aux(self, prefix: str, index: int, arr: list) -> tuple[int, int]|None:
+        if arr is None:
+            return None
+        elif len(prefix) == index or len(prefix) == 0:
+            return arr[-2:]
+        return self.prefix_search_aux(prefix, index+1, arr[ord(prefix[index]) - 97])
+
+def _letters(number: int) -> str:
+    """Writes number in base 26 with the letters a-z, least significant first"""
+    text = ""
+    while number > 0:
+        number, digit = divmod(number, 26)
+        text += chr(97 + digit)
+    return text
+
+def scaled_dictionary(dictionary: list, factor: int, seed: int = 0) -> list:
+    """
+    Function Description:
+        Makes a dictionary factor times larger, with copy c of every word followed by c written
+        in letters, so all words stay unique and share the prefixes of the real ones.
+        Frequencies of the copies are random, with many ties.
+
+    Input:
+        dictionary: output of load_dictionary
+        factor: number of copies
+        seed: seed of the random generator, so runs are repeatable
+
+    Output:
+        the scaled dictionary, in the same format
+    """
+    rng = Random(seed)
+    scaled = []
+    for copy in range(factor):
+        suffix = _letters(copy)
+        for word, definition, frequency in dictionary:
+            scaled.append([word + suffix, definition, frequency if copy == 0 else rng.randint(1, 100)])
+    return scaled
+
+def bench_trie(trie_type: type, dictionary: list, queries: int = 100000, seed: int = 0, 
+               **options) -> dict:
+    """
+    Function Description:
+        Measures the time to build a trie of trie_type and to run prefix_search on random
+        prefixes of its words.
+
+    Input:
+        options: keyword arguments of trie_type
+
+    Output:
+        dict of the times in seconds
+    """
+    rng = Random(seed)
+    prefixes = []
+    for _ in range(queries):
+        word = rng.choice(dictionary)[0]
+        prefixes.append(word[:rng.randint(0, len(word))])
+    time = perf_counter()
+    trie = trie_type(dictionary, **options)
+    build = perf_counter() - time
+    time = perf_counter()
+    for prefix in prefixes:
+        trie.prefix_search(prefix)
+    return {"build": build, "search": perf_counter() - time}
+
+def bench_iterative(factor: int = 100) -> dict:
+    """
+    Function Description:
+        Compares the iterative Trie against the recursive one on Dictionary.txt scaled up.
+
+    Output:
+        dict of the times of both
+    """
+    dictionary = scaled_dictionary(load_dictionary("Dictionary.txt"), factor)
+    return {"iterative": bench_trie(Trie, dictionary), "recursive": bench_trie(RecursiveTrie, dictionary)}
+
+def bench_layouts(factor: int = 10) -> dict:
+    """
+    Function Description:
+        Compares the list, array and dict layouts of Trie on Dictionary.txt scaled up: build and 
+        search time, and bytes per word of the nodes.
+
+    Output:
+        dict of the measurements of every layout
+    """
+    dictionary = scaled_dictionary(load_dictionary("Dictionary.txt"), factor)
+    results = {}
+    for layout in ("list", "array", "dict"):
+        results[layout] = bench_trie(Trie, dictionary, layout=layout)
+        results[layout]["bytes_per_word"] = Trie(dictionary, layout).bytes_per_word()
+    return results
+
+def _temporary_file(suffix: str) -> str:
+    """Creates an empty file in the temporary directory and returns its path"""
+    handle, path = tempfile.mkstemp(suffix)
+    os.close(handle)
+    return path
+
+def bench_snapshot(factor: int = 100) -> dict:
+    """
+    Function Description:
+        Compares starting up by loading the dictionary and building the Trie against opening a
+        snapshot written by Trie.save, including the first query. Both files are temporary.
+
+    Output:
+        dict of the times in seconds of both, and the size of the snapshot in bytes
+    """
+    with open("Dictionary.txt", encoding="utf-8") as file:
+        text = file.read()
+    scaled, path = _temporary_file(".txt"), _temporary_file(".bin")
+    try:
+        with open(scaled, "w", encoding="utf-8") as file:
+            for copy in range(factor):
+                file.write(text)                          # duplicates words, same parsing work
+        time = perf_counter()
+        trie = Trie(load_dictionary(scaled), "array")
+        trie.prefix_search("ab")
+        build = perf_counter() - time
+        trie.save(path)
+        time = perf_counter()
+        Trie.load(path).prefix_search("ab")               # unmapped once no longer referenced
+        return {"build": build, "load": perf_counter() - time, "bytes": os.path.getsize(path)}
+    finally:
+        os.remove(scaled)
+        os.remove(path)
+
+def bench_loader(factor: int = 700) -> dict:
+    """
+    Function Description:
+        Compares load_dictionary against iter_dictionary on Dictionary.txt repeated factor times
+        (3000 records each) in a temporary file, and feeding a Trie from iter_dictionary.
+
+    Output:
+        dict of the times in seconds and the number of records
+    """
+    with open("Dictionary.txt", encoding="utf-8") as file:
+        text = file.read()
+    path = _temporary_file(".txt")
+    try:
+        with open(path, "w", encoding="utf-8") as file:
+            for _ in range(factor):
+                file.write(text)
+        time = perf_counter()
+        records = len(load_dictionary(path))
+        old = perf_counter() - time
+        time = perf_counter()
+        for _ in iter_dictionary(path):
+            pass
+        new = perf_counter() - time
+        time = perf_counter()
+        Trie([], "array").extend(iter_dictionary(path))
+        feed = perf_counter() - time
+    finally:
+        os.remove(path)
+    return {"records": records, "load_dictionary": old, "iter_dictionary": new, "trie_extend": feed}
+
+def bench_top_k(factor: int = 100, queries: int = 2000, seed: int = 0) -> dict:
+    """
+    Function Description:
+        Measures the latency of prefix_top_k on every keystroke of random words of Dictionary.txt
+        scaled up, for k from 5 to 20.
+
+    Output:
+        dict of the mean latency in seconds for every k
+    """
+    rng = Random(seed)
+    dictionary = scaled_dictionary(load_dictionary("Dictionary.txt"), factor, seed)
+    trie = Trie(dictionary)
+    prefixes = []
+    for _ in range(queries):
+        word = rng.choice(dictionary)[0]
+        prefixes += [word[:i] for i in range(1, len(word)+1)]
+    results = {}
+    for k in (5, 10, 20):
+        time = perf_counter()
+        for prefix in prefixes:
+            trie.prefix_top_k(prefix, k)
+        results[k] = (perf_counter() - time) / len(prefixes)
+    return results
+
+def bench_session(factor: int = 100, sessions: int = 2000, seed: int = 0) -> dict:
+    """
+    Function Description:
+        Simulates typing sessions on Dictionary.txt scaled up: random words typed one character 
+        at a time with some typos corrected by backspace, answered by a TrieSession against 
+        prefix_search of the whole prefix on every keystroke.
+
+    Output:
+        dict of the mean latency in seconds per keystroke of both, for every layout
+    """
+    rng = Random(seed)
+    dictionary = scaled_dictionary(load_dictionary("Dictionary.txt"), factor, seed)
+    keystrokes = []                                       # character typed, None for backspace
+    for _ in range(sessions):
+        for char in rng.choice(dictionary)[0]:
+            if rng.random() < 0.1:
+                keystrokes += [chr(rng.randint(97, 122)), None]
+            keystrokes.append(char)
+        keystrokes.append("")                             # end of the session
+    results = {}
+    for layout in ("list", "array"):
+        trie = Trie(dictionary, layout)
+        time = perf_counter()
+        session = trie.session()
+        for char in keystrokes:
+            if char == "":
+                session = trie.session()
+            elif char is None:
+                session.backspace()
+            else:
+                session.type(char)
+        cursor = perf_counter() - time
+        time = perf_counter()
+        prefix = ""
+        for char in keystrokes:
+            prefix = "" if char == "" else prefix[:-1] if char is None else prefix + char
+            trie.prefix_search(prefix)
+        search = perf_counter() - time
+        results[layout] = {"session": cursor / len(keystrokes), "prefix_search": search / len(keystrokes)}
+    return results
+
+def bench_sharded(factor: int = 100) -> dict:
+    """
+    Function Description:
+        Measures the build time of Trie.sharded on Dictionary.txt scaled up, for every number of
+        processes from 1 to the number of CPUs, against building the Trie in one go.
+
+    Output:
+        dict of the times in seconds for every layout, "serial" for Trie and a number of 
+        processes for Trie.sharded
+    """
+    dictionary = scaled_dictionary(load_dictionary("Dictionary.txt"), factor)
+    results = {}
+    for layout in ("list", "array"):
+        time = perf_counter()
+        Trie(dictionary, layout)
+        results[layout] = {"serial": perf_counter() - time}
+        for processes in range(1, (os.cpu_count() or 1) + 1):
+            time = perf_counter()
+            Trie.sharded(dictionary, layout, processes)
+            results[layout][processes] = perf_counter() - time
+    return results
+
+def bench_fuzzy(queries: int = 500, k: int = 10, seed: int = 0) -> dict:
+    """
+    Function Description:
+        Measures the latency of fuzzy_search on Dictionary.txt, for random prefixes of its words
+        with one random typo, and max_edits from 0 to 2.
+
+    Output:
+        dict of the mean and worst latency in seconds for every max_edits
+    """
+    rng = Random(seed)
+    dictionary = load_dictionary("Dictionary.txt")
+    trie = Trie(dictionary)
+    prefixes = []
+    for _ in range(queries):
+        word = rng.choice(dictionary)[0]
+        prefix = word[:rng.randint(1, len(word))]
+        i = rng.randrange(len(prefix))
+        prefixes.append(prefix[:i] + chr(rng.randint(97, 122)) + prefix[i+1:])
+    results = {}
+    for max_edits in (0, 1, 2):
+        latencies = []
+        for prefix in prefixes:
+            time = perf_counter()
+            trie.fuzzy_search(prefix, k, max_edits)
+            latencies.append(perf_counter() - time)
+        results[max_edits] = {"mean": sum(latencies) / len(latencies), "max": max(latencies)}
+    return results
+
+def bench_radix(factor: int = 10) -> dict:
+    """
+    Function Description:
+        Compares RadixTrie against the layouts of Trie on Dictionary.txt scaled up: build and 
+        search time, and bytes per word of the nodes.
+
+    Output:
+        dict of the measurements of every trie
+    """
+    dictionary = scaled_dictionary(load_dictionary("Dictionary.txt"), factor)
+    results = {"radix": bench_trie(RadixTrie, dictionary)}
+    results["radix"]["bytes_per_word"] = RadixTrie(dictionary).bytes_per_word()
+    for layout in ("list", "array", "dict"):
+        results[layout] = bench_trie(Trie, dictionary, layout=layout)
+        results[layout]["bytes_per_word"] = Trie(dictionary, layout).bytes_per_word()
+    return results
+
+def random_group(people: int, choices: int = 3, seed: int = 0) -> tuple[list[list[int]], list[int]]:
+    """
+    Function Description:
+        Makes preferences and licences of people for which a valid allocation exists: person i
+        can go in car i//5 and choices-1 other random cars, and 2 of every 5 people have a 
+        licence, plus about a quarter of the others. allocate may still return None for them, 
+        as neither engine always finds an allocation that exists.
+
+    Output:
+        preferences and licences, as taken by allocate
+    """
+    rng = Random(seed)
+    cars = -(-people // 5)
+    preferences, licences = [], []
+    for i in range(people):
+        preferences.append(list({i // 5, *(rng.randrange(cars) for _ in range(choices - 1))}))
+        if i % 5 < 2 or rng.random() < 0.25:
+            licences.append(i)
+    return preferences, licences
+
+def bench_allocate(sizes: tuple[int] = (500, 1000, 2000, 5000)) -> dict:
+    """
+    Function Description:
+        Compares the time of allocate with the Ford-Fulkerson and Dinic engines on groups of 
+        people from random_group. The engines can give different outcomes on the same group, 
+        so the outcome of both is reported, and the times only compare the same work where
+        "agree" is True.
+
+    Output:
+        dict for every number of people of the time in seconds of both engines, None if the
+        engine ran out of recursion depth, the outcome of both engines, "allocated", "None" or
+        "RecursionError", and whether they agree
+    """
+    results = {}
+    for people in sizes:
+        preferences, licences = random_group(people)
+        results[people] = {}
+        for engine in ("ford_fulkerson", "dinic"):
+            time = perf_counter()
+            try:
+                allocation = allocate(preferences, licences, engine)
+            except RecursionError:
+                results[people][engine] = None
+                results[people][engine + "_outcome"] = "RecursionError"
+                continue
+            results[people][engine] = perf_counter() - time
+            results[people][engine + "_outcome"] = "None" if allocation is None else "allocated"
+        outcomes = results[people]["ford_fulkerson_outcome"], results[people]["dinic_outcome"]
+        results[people]["agree"] = outcomes[0] == outcomes[1]
+    return results
+
+if __name__ == "__main__":
+    print(bench_iterative())
+    print(bench_layouts())
+    print(bench_snapshot())
+    print(bench_loader())
+    print(bench_top_k())
+    print(bench_session())
+    print(bench_sharded())
+    print(bench_fuzzy())
+    print(bench_radix())
+    print(bench_allocate())
@@ -0,0 +1,31 @@
+import unittest
+
+from assignment2 import Trie
+
+LAYOUTS = ("list", "array", "dict")
+
+class TrieShardedTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dictionary = [["a" * 1200, "long a", 1], ["x" * 1500 + "y", "long x", 3], ["ab", "ab", 2],
+                           ["b", "b", 2], ["ab", "second ab", 2], ["", "empty", 1], ["xy", "xy", 3]]
+
+    def test_same_as_trie(self):
+        for layout in LAYOUTS:
+            for processes in (1, 2):
+                sharded = Trie.sharded(self.dictionary, layout, processes)
+                trie = Trie(self.dictionary, layout)
+                for prefix in ("", "a", "a" * 600, "a" * 1200, "a" * 1201, "ab", "b", "x" * 1500, "xy", "z"):
+                    self.assertEqual(sharded.prefix_search(prefix), trie.prefix_search(prefix))
+                    self.assertEqual(sharded.prefix_top_k(prefix, 4), trie.prefix_top_k(prefix, 4))
+
+    def test_update_after_sharded(self):
+        for layout in LAYOUTS:
+            trie = Trie.sharded(self.dictionary, layout, 2)
+            self.assertEqual(trie.delete("ab"), 2)
+            self.assertEqual(trie.update_frequency("a" * 1200, 5), 1)
+            self.assertEqual(trie.prefix_search("a"), ["a" * 1200, "long a", 1])
+            self.assertEqual(trie.prefix_search(""), ["a" * 1200, "long a", 5])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import os
+import tempfile
+import unittest
+from random import Random
+
+from assignment2 import Trie
+
+LAYOUTS = ("list", "array", "dict")
+
+class TrieUpdateTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dictionary = [["ab", "first ab", 5], ["abc", "abc", 5], ["b", "b", 2], 
+                           ["ab", "second ab", 5], ["abd", "abd", 1]]
+
+    def test_insert(self):
+        for layout in LAYOUTS:
+            trie = Trie(self.dictionary, layout)
+            trie.insert("abe", "abe", 9)
+            self.assertEqual(trie.prefix_search("a"), ["abe", "abe", 5])
+            self.assertEqual(trie.prefix_search("abe"), ["abe", "abe", 1])
+            self.assertEqual(trie.prefix_search(""), ["abe", "abe", 6])
+            trie.insert("c", "c", 1)
+            self.assertEqual(trie.prefix_search("c"), ["c", "c", 1])
+
+    def test_delete_to_empty(self):
+        for layout in LAYOUTS:
+            trie = Trie([["ab", "x", 1]], layout)
+            self.assertEqual(trie.delete("ab"), 1)
+            self.assertEqual(trie.prefix_search(""), [None, None, 0])
+            self.assertEqual(trie.prefix_search("a"), [None, None, 0])
+            self.assertEqual(trie.prefix_top_k("", 3), [])
+            self.assertEqual(trie.delete("ab"), 0)
+            trie.insert("cd", "y", 2)
+            self.assertEqual(trie.prefix_search(""), ["cd", "y", 1])
+
+    def test_duplicate_words(self):
+        for layout in LAYOUTS:
+            trie = Trie(self.dictionary, layout)
+            self.assertEqual(trie.prefix_search("a"), ["ab", "first ab", 4])
+            trie.delete("b")                                # ties keep the first inserted ab
+            self.assertEqual(trie.prefix_search("a"), ["ab", "first ab", 4])
+            self.assertEqual(trie.prefix_top_k("ab", 2), [["ab", "first ab", 5], ["ab", "second ab", 5]])
+            self.assertEqual(trie.delete("ab"), 2)
+            self.assertEqual(trie.prefix_search("a"), ["abc", "abc", 2])
+            self.assertEqual(trie.prefix_search("ab"), ["abc", "abc", 2])
+
+    def test_update_frequency(self):
+        for layout in LAYOUTS:
+            trie = Trie(self.dictionary, layout)
+            self.assertEqual(trie.update_frequency("abd", 7), 1)
+            self.assertEqual(trie.prefix_search(""), ["abd", "abd", 5])
+            self.assertEqual(trie.update_frequency("ab", 8), 2)
+            self.assertEqual(trie.prefix_search("a"), ["ab", "first ab", 4])
+            trie.update_frequency("ab", 1)
+            self.assertEqual(trie.prefix_search("ab"), ["abd", "abd", 4])
+            self.assertEqual(trie.update_frequency("zz", 1), 0)
+
+    def test_dictionary_not_changed(self):
+        for layout in LAYOUTS:
+            trie = Trie(self.dictionary, layout)
+            trie.insert("c", "c", 1)
+            trie.delete("b")
+            trie.update_frequency("abc", 1)
+            self.assertEqual(self.dictionary, [["ab", "first ab", 5], ["abc", "abc", 5], ["b", "b", 2],
+                                               ["ab", "second ab", 5], ["abd", "abd", 1]])
+
+    def test_same_as_rebuilt(self):
+        rng = Random(0)
+        words = ["".join(rng.choice("abc") for _ in range(rng.randint(0, 4))) for _ in range(40)]
+        for layout in LAYOUTS:
+            trie = Trie([[word, str(i), rng.randint(1, 3)] for i, word in enumerate(words)], layout)
+            for step in range(300):
+                word = rng.choice(words)
+                action = rng.randrange(3)
+                if action == 0:
+                    trie.insert(word, "new " + str(step), rng.randint(1, 3))
+                elif action == 1:
+                    trie.delete(word)
+                else:
+                    trie.update_frequency(word, rng.randint(1, 3))
+                rebuilt = Trie([entry for entry in trie.dictionary if entry is not None], layout)
+                for prefix in set(word[:i] for word in words for i in range(len(word) + 1)):
+                    self.assertEqual(trie.prefix_search(prefix), rebuilt.prefix_search(prefix))
+                    self.assertEqual(trie.prefix_top_k(prefix, 3), rebuilt.prefix_top_k(prefix, 3))
+
+    def test_save_after_delete(self):
+        for layout in LAYOUTS:
+            trie = Trie(self.dictionary, layout)
+            trie.delete("ab")
+            handle, path = tempfile.mkstemp()
+            os.close(handle)
+            try:
+                trie.save(path)
+                loaded = Trie.load(path)
+                self.assertEqual(len(loaded.dictionary), 3)
+                for prefix in ("", "a", "ab", "abc", "b"):
+                    self.assertEqual(loaded.prefix_search(prefix), trie.prefix_search(prefix))
+                    self.assertEqual(loaded.prefix_top_k(prefix, 5), trie.prefix_top_k(prefix, 5))
+                with self.assertRaises(ValueError):
+                    loaded.insert("c", "c", 1)
+                del loaded
+            finally:
+                os.remove(path)
+
+if __name__ == "__main__":
+    unittest.main()